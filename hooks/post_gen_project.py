@@ -29,6 +29,9 @@ def main():
     
     # Get template variables
     include_user_model = "{{ cookiecutter.include_user_model }}"
+    include_authentication = "{{ cookiecutter.include_authentication }}"
+    json_response = "{{ cookiecutter.json_response }}"
+    include_metrics = "{{ cookiecutter.include_metrics }}"
     include_docker = "{{ cookiecutter.include_docker }}"
     include_testing = "{{ cookiecutter.include_testing }}"
     include_github_actions = "{{ cookiecutter.include_github_actions }}"
@@ -43,12 +46,34 @@ def main():
         remove_file_if_exists("app/schemas/user.py") 
         remove_file_if_exists("app/crud/user.py")
         remove_file_if_exists("app/api/v1/endpoints/users.py")
+        remove_file_if_exists("app/core/pagination.py")
+        remove_file_if_exists("app/core/http_cache.py")
+        remove_file_if_exists("app/core/export.py")
+        remove_dir_if_exists("benchmarks")
         
         # Create empty endpoints directory
         os.makedirs("app/api/v1/endpoints", exist_ok=True)
         with open("app/api/v1/endpoints/__init__.py", "w") as f:
             f.write("# Import your endpoint routers here\n")
     
+    # Remove password hashing helpers if JWT authentication is not used
+    if include_authentication != "jwt":
+        remove_file_if_exists("app/core/security.py")
+        remove_file_if_exists("benchmarks/login_load.py")
+        remove_file_if_exists("tests/test_event_loop.py")
+        remove_file_if_exists("tests/test_security.py")
+        remove_file_if_exists("benchmarks/jwt_auth.py")
+
+    # Remove the fast JSON response class if the stdlib encoder is used
+    if json_response == "stdlib":
+        remove_file_if_exists("app/core/responses.py")
+        remove_file_if_exists("benchmarks/json_response.py")
+
+    # Remove the metrics subsystem if not needed
+    if include_metrics == "no":
+        remove_file_if_exists("app/core/metrics.py")
+        remove_file_if_exists("tests/test_metrics.py")
+
     # Remove Docker files if not needed
     if include_docker == "no":
         print("🗑️  Removing Docker files...")
@@ -23,6 +23,9 @@ def discover_models() -> List[Type]:
 
 def setup_admin(fastapi_app: FastAPI) -> Admin:
     _import_all_models()
+    # Custom routes must be registered before Admin mounts "/admin", otherwise
+    # the mount swallows paths like /admin/health
+    register_custom_routes(fastapi_app)
     admin_title = f"{getattr(fastapi_app, 'title', 'Application')} Admin"
     admin = Admin(app=fastapi_app, engine=engine, title=admin_title)
 
@@ -35,5 +38,4 @@ def setup_admin(fastapi_app: FastAPI) -> Admin:
             continue
 
     register_custom_model_views(admin)
-    register_custom_routes(fastapi_app)
     return admin
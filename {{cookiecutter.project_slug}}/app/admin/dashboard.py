@@ -1,5 +1,14 @@
-from fastapi import APIRouter
+import html
 
+from fastapi import APIRouter
+from fastapi.responses import HTMLResponse
+from app.core.cache import get_cache_stats
+from app.core.config import settings
+from app.db.session import engine, get_pool_status
+from app.db.slow_queries import explain_slow_queries, get_slow_queries
+{% if cookiecutter.include_authentication == "jwt" -%}
+from app.core.security import get_hash_pool_stats
+{% endif %}
 router = APIRouter()
 
 
@@ -8,6 +17,104 @@ def admin_health():
     return {"status": "ok"}
 
 
+@router.get("/admin/db/pool")
+def admin_db_pool():
+    """Live connection pool occupancy (checked out, overflow, waiters)"""
+    return get_pool_status()
+
+
+{% if cookiecutter.use_async == "yes" -%}
+async def _capture_plans() -> None:
+    """EXPLAIN recorded slow statements on a connection of their own"""
+    if settings.slow_query_explain:
+        async with engine.connect() as conn:
+            await conn.run_sync(explain_slow_queries)
+
+
+@router.get("/admin/db/slow-queries")
+async def admin_slow_queries():
+    """Recorded slow statements, newest first"""
+    await _capture_plans()
+    return get_slow_queries()
+
+
+@router.get("/admin/slow-queries", response_class=HTMLResponse)
+async def admin_slow_queries_page():
+    """Slow-query log dashboard"""
+    await _capture_plans()
+    return _render_slow_queries(get_slow_queries())
+{% else -%}
+def _capture_plans() -> None:
+    """EXPLAIN recorded slow statements on a connection of their own"""
+    if settings.slow_query_explain:
+        with engine.connect() as conn:
+            explain_slow_queries(conn)
+
+
+@router.get("/admin/db/slow-queries")
+def admin_slow_queries():
+    """Recorded slow statements, newest first"""
+    _capture_plans()
+    return get_slow_queries()
+
+
+@router.get("/admin/slow-queries", response_class=HTMLResponse)
+def admin_slow_queries_page():
+    """Slow-query log dashboard"""
+    _capture_plans()
+    return _render_slow_queries(get_slow_queries())
+{% endif %}
+
+_PAGE_STYLE = """
+body { font-family: sans-serif; margin: 2rem; }
+table { border-collapse: collapse; width: 100%; }
+th, td { border: 1px solid #ddd; padding: 0.4rem; text-align: left; vertical-align: top; }
+pre { margin: 0; white-space: pre-wrap; }
+"""
+
+
+def _render_slow_queries(entries: list) -> str:
+    rows = "".join(
+        "<tr><td>{recorded_at}</td><td>{duration_ms:.1f}</td><td>{route}</td>"
+        "<td><pre>{statement}</pre></td><td><code>{parameters}</code></td><td><pre>{plan}</pre></td></tr>".format(
+            recorded_at=html.escape(entry["recorded_at"]),
+            duration_ms=entry["duration_ms"],
+            route=html.escape(entry["route"] or "-"),
+            statement=html.escape(entry["statement"]),
+            parameters=html.escape(entry["parameters"]),
+            plan=html.escape(entry["plan"] or ""),
+        )
+        for entry in entries
+    ) or '<tr><td colspan="6">No statements above the threshold yet</td></tr>'
+    return f"""<!DOCTYPE html>
+<html>
+<head>
+<title>Slow queries - {html.escape(settings.project_name)}</title>
+<style>{_PAGE_STYLE}</style>
+</head>
+<body>
+<h1>Slow queries</h1>
+<p>Last {settings.slow_query_log_size} statements slower than {settings.slow_query_threshold_ms:g} ms, newest first.</p>
+<table>
+<tr><th>Recorded at (UTC)</th><th>ms</th><th>Route</th><th>Statement</th><th>Parameters</th><th>Plan</th></tr>
+{rows}
+</table>
+</body>
+</html>"""
+
+
+@router.get("/admin/cache")
+def admin_cache():
+    """Hit/miss statistics for application caches"""
+    return get_cache_stats()
+{% if cookiecutter.include_authentication == "jwt" %}
+
+@router.get("/admin/password-hashing")
+def admin_password_hashing():
+    """Password hashing pool occupancy and queue depth"""
+    return get_hash_pool_stats()
+{% endif %}
+
 def register_custom_routes(app):
     """Attach optional custom admin routes (dashboards, charts)."""
     app.include_router(router)
@@ -1,20 +1,28 @@
 {% if cookiecutter.include_user_model == "yes" -%}
-from fastapi import APIRouter, Depends, HTTPException, status
+{% set async_ = "async " if cookiecutter.use_async == "yes" else "" -%}
+{% set await_ = "await " if cookiecutter.use_async == "yes" else "" -%}
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 {% if cookiecutter.include_authentication == "jwt" -%}
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from jose import JWTError, jwt
 from datetime import datetime, timedelta
 {% endif -%}
+{% if cookiecutter.use_async == "yes" -%}
+from sqlalchemy.ext.asyncio import AsyncSession as Session
+{% else -%}
 from sqlalchemy.orm import Session
-from typing import List{% if cookiecutter.include_authentication == "jwt" %}, Optional{% endif %}
-{% if cookiecutter.include_authentication == "jwt" -%}
-from app.models.user import User
 {% endif -%}
-from app.db.session import get_db
+from typing import List, Literal, Optional, Tuple
+from app.db.replicas import read_is_current, reads_own_writes
+from app.db.session import get_db, get_read_db
 from app.schemas.user import (
     UserCreate,
     UserUpdate,
     UserResponse,
+    UserFilter,
+    UserBulkCreate,
+    UserBulkCreateResponse,
+    user_projection,
     {% if cookiecutter.include_authentication == "jwt" -%}
     UserLogin,
     Token,
@@ -22,12 +30,46 @@ from app.schemas.user import (
     {% endif -%}
 )
 from app.crud import user as user_crud
-{% if cookiecutter.include_authentication == "jwt" -%}
 from app.core.config import settings
+from app.core.export import EXPORT_MEDIA_TYPES, get_row_encoder
+from app.core.http_cache import is_not_modified, make_etag, not_modified_response, validator_headers
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core import response_cache
+from app.core.response_cache import CachedResponse
+{% if cookiecutter.include_authentication == "jwt" -%}
+from app.core.security import InvalidTokenError, decode_access_token, encode_access_token
 {% endif -%}
 
 router = APIRouter()
 
+
+def parse_fields(fields: Optional[str] = None) -> Optional[Tuple[str, ...]]:
+    """Dependency turning `?fields=a,b` into a validated sparse fieldset (always including id)"""
+    if not fields:
+        return None
+    requested = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = sorted(set(requested) - set(user_crud.EXPORT_FIELDS))
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(unknown)}"
+        )
+    return tuple(dict.fromkeys(["id", *requested]))
+
+
+def projected_response(rows, fields: Tuple[str, ...], headers: Optional[dict] = None) -> Response:
+    """Serialize Core rows through the slim model for `fields`, skipping validation
+
+    Values come straight from the database, so the rows are wrapped with
+    `model_construct` and dumped by pydantic-core in one pass.
+    """
+    model, list_adapter = user_projection(fields)
+    if isinstance(rows, list):
+        content = list_adapter.dump_json([model.model_construct(**row._mapping) for row in rows])
+    else:
+        content = model.model_construct(**rows._mapping).model_dump_json()
+    return Response(content=content, media_type="application/json", headers=headers)
+
 {% if cookiecutter.include_authentication == "jwt" -%}
 # OAuth2 scheme
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
@@ -41,11 +83,10 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     else:
         expire = datetime.utcnow() + timedelta(minutes=settings.access_token_expire_minutes)
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
-    return encoded_jwt
+    return encode_access_token(to_encode)
 
 
-async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+{{ async_ }}def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
     """Get current user from JWT token"""
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -53,21 +94,25 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = De
         headers={"WWW-Authenticate": "Bearer"},
     )
     try:
-        payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
+        payload = decode_access_token(token)
         username: str = payload.get("sub")
         if username is None:
             raise credentials_exception
         token_data = TokenData(username=username)
-    except JWTError:
+    except InvalidTokenError:
         raise credentials_exception
     
-    user = user_crud.get_user_by_username(db, username=token_data.username)
-    if user is None:
+    principal = {{ await_ }}user_crud.get_principal(db, username=token_data.username)
+    # End the lookup's read-only transaction so its connection (the single
+    # writer, under the concurrent SQLite profile) is not held while the
+    # endpoint runs; the endpoint's own statements check one out again
+    {{ await_ }}db.commit()
+    if principal is None:
         raise credentials_exception
-    return user
+    return principal
 
 
-async def get_current_active_user(current_user: User = Depends(get_current_user)):
+{{ async_ }}def get_current_active_user(current_user: UserResponse = Depends(get_current_user)):
     """Get current active user"""
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
@@ -75,9 +120,9 @@ async def get_current_active_user(current_user: User = Depends(get_current_user)
 
 
 @router.post("/token", response_model=Token)
-async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+{{ async_ }}def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
     """Login and get access token"""
-    user = user_crud.authenticate_user(db, form_data.username, form_data.password)
+    user = {{ await_ }}user_crud.authenticate_user(db, form_data.username, form_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -92,70 +137,211 @@ async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(
 
 
 @router.get("/me", response_model=UserResponse)
-async def read_users_me(current_user: User = Depends(get_current_active_user)):
-    """Get current user profile"""
+async def read_users_me(
+    request: Request,
+    response: Response,
+    current_user: UserResponse = Depends(get_current_active_user)
+):
+    """Get current user profile, answering conditional requests with 304"""
+    etag = make_etag(current_user.id, current_user.created_at, current_user.version)
+    last_modified = current_user.updated_at or current_user.created_at
+    headers = validator_headers("read_users_me", etag, last_modified)
+    if is_not_modified(request, etag, last_modified):
+        return not_modified_response(headers)
+    response.headers.update(headers)
     return current_user
 {% endif -%}
 
 
 @router.get("/", response_model=List[UserResponse])
-def get_users(
-    skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(get_db){% if cookiecutter.include_authentication == "jwt" %},
-    current_user: User = Depends(get_current_active_user){% endif %}
+{{ async_ }}def get_users(
+    request: Request,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=settings.max_page_size),
+    cursor: Optional[str] = None,
+    sort: str = "id",
+    filters: UserFilter = Depends(),
+    count: Optional[Literal["estimated", "exact"]] = None,
+    fields: Optional[Tuple[str, ...]] = Depends(parse_fields),
+    db: Session = Depends(get_read_db){% if cookiecutter.include_authentication == "jwt" %},
+    current_user: UserResponse = Depends(get_current_active_user){% endif %}
+):
+    """Get users with filters, sorting and offset (skip/limit) or keyset (cursor/limit) pagination
+
+    `sort` is one of the indexed keys in `crud.user.SORT_KEYS`, "-" prefixed
+    for descending. With sort=id / -id a full page sets the `X-Next-Cursor`
+    header; pass it back as `cursor` to fetch the next page without an OFFSET
+    scan. `count=estimated` (cheap, possibly stale) or `count=exact` adds the
+    total as `X-Total-Count`; counts of filtered listings are always exact.
+    `fields=id,email` returns only those columns (id is always included).
+
+    Read-only fast path: rows are fetched as Core rows of the response
+    columns (no ORM hydration or identity map) and serialized without
+    re-validation, with or without `fields`. Rendered pages are kept in the
+    response cache until the next user write.
+    """
+    cache_key = {{ await_ }}response_cache.cache_key("users", variant=response_cache.query_variant(request))
+    cached = None if reads_own_writes(db) else {{ await_ }}response_cache.lookup(cache_key)
+    if cached is not None:
+        return cached.to_response()
+
+    after_id = None
+    if cursor is not None:
+        try:
+            after_id = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid pagination cursor"
+            )
+    try:
+        users = {{ await_ }}user_crud.get_users(
+            db,
+            skip=skip,
+            limit=limit,
+            after_id=after_id,
+            filters=filters,
+            sort=sort,
+            fields=fields or user_crud.EXPORT_FIELDS,
+        )
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc)
+        )
+    headers = {}
+    if len(users) == limit and sort in ("id", "-id"):
+        headers["X-Next-Cursor"] = encode_cursor(users[-1].id)
+    if count is not None:
+        total = {{ await_ }}user_crud.count_users(db, exact=count == "exact", filters=filters)
+        headers["X-Total-Count"] = str(total)
+    response = projected_response(users, fields or user_crud.EXPORT_FIELDS, headers)
+    if {{ await_ }}read_is_current(db):
+        {{ await_ }}response_cache.store(cache_key, CachedResponse(response.body, headers))
+    return response
+
+
+@router.get("/export", response_class=StreamingResponse)
+{{ async_ }}def export_users(
+    export_format: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+    db: Session = Depends(get_read_db){% if cookiecutter.include_authentication == "jwt" %},
+    current_user: UserResponse = Depends(get_current_active_user){% endif %}
 ):
-    """Get all users with pagination"""
-    return user_crud.get_users(db, skip=skip, limit=limit)
+    """Stream every user as NDJSON or CSV
+
+    Rows are serialized as they come off a server-side cursor and sent in
+    chunks of EXPORT_BATCH_SIZE rows, so memory stays flat regardless of
+    table size.
+    """
+    header, encode = get_row_encoder(export_format, user_crud.EXPORT_FIELDS)
+
+    {{ async_ }}def chunks():
+        if header:
+            yield header
+        batch = []
+        {{ async_ }}for row in user_crud.stream_users(db):
+            batch.append(encode(row))
+            if len(batch) >= settings.export_batch_size:
+                yield "".join(batch)
+                batch.clear()
+        if batch:
+            yield "".join(batch)
+
+    return StreamingResponse(
+        chunks(),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="users.{export_format}"'},
+    )
 
 
 @router.get("/{user_id}", response_model=UserResponse)
-def get_user(
+{{ async_ }}def get_user(
     user_id: int,
-    db: Session = Depends(get_db){% if cookiecutter.include_authentication == "jwt" %},
-    current_user: User = Depends(get_current_active_user){% endif %}
+    request: Request,
+    fields: Optional[Tuple[str, ...]] = Depends(parse_fields),
+    db: Session = Depends(get_read_db){% if cookiecutter.include_authentication == "jwt" %},
+    current_user: UserResponse = Depends(get_current_active_user){% endif %}
 ):
-    """Get user by ID"""
-    user = user_crud.get_user(db, user_id)
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found"
-        )
-    return user
+    """Get user by ID; `fields=id,email` returns only those columns
+
+    Sends a weak ETag derived from created_at and the row version, and
+    Last-Modified from created_at / updated_at.
+    Rendered bodies are served from the response cache until the user is
+    written; on a miss, If-None-Match / If-Modified-Since are answered from a
+    version-only query, returning 304 without loading or serializing the user.
+    """
+    cache_key = {{ await_ }}response_cache.cache_key("users", user_id, ",".join(fields or ()))
+    cached = None if reads_own_writes(db) else {{ await_ }}response_cache.lookup(cache_key)
+    if cached is not None:
+        if is_not_modified(request, cached.headers["ETag"], cached.last_modified):
+            return not_modified_response(cached.headers)
+        return cached.to_response()
+
+    not_found = HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail="User not found"
+    )
+    if "if-none-match" in request.headers or "if-modified-since" in request.headers:
+        version = {{ await_ }}user_crud.get_user_version(db, user_id)
+        if version is None:
+            raise not_found
+        etag = make_etag(user_id, version.created_at, version.version, fields)
+        last_modified = version.updated_at or version.created_at
+        if is_not_modified(request, etag, last_modified):
+            return not_modified_response(validator_headers("get_user", etag, last_modified))
+
+    columns = fields or user_crud.EXPORT_FIELDS
+    # Validator columns ride along; the projection drops them
+    user = {{ await_ }}user_crud.get_user(
+        db, user_id, fields=tuple(dict.fromkeys([*columns, "created_at", "updated_at", "version"]))
+    )
+    if user is None:
+        raise not_found
+    etag = make_etag(user_id, user.created_at, user.version, fields)
+    last_modified = user.updated_at or user.created_at
+    headers = validator_headers("get_user", etag, last_modified)
+    response = projected_response(user, columns, headers)
+    if {{ await_ }}read_is_current(db):
+        {{ await_ }}response_cache.store(cache_key, CachedResponse(response.body, headers, last_modified))
+    return response
 
 
 @router.post("/", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-def create_user(user: UserCreate, db: Session = Depends(get_db)):
+{{ async_ }}def create_user(user: UserCreate, db: Session = Depends(get_db)):
     """Create new user"""
-    # Check if user with email already exists
-    existing_user = user_crud.get_user_by_email(db, user.email)
-    if existing_user:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="User with this email already exists"
-        )
-    {% if cookiecutter.include_authentication == "jwt" -%}
-    # Check if user with username already exists
-    existing_username = user_crud.get_user_by_username(db, user.username)
-    if existing_username:
+    try:
+        return {{ await_ }}user_crud.create_user(db, user)
+    except user_crud.DuplicateUserError as exc:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="User with this username already exists"
+            detail=str(exc)
         )
-    {% endif -%}
-    return user_crud.create_user(db, user)
+
+
+@router.post("/bulk", response_model=UserBulkCreateResponse)
+{{ async_ }}def create_users_bulk(
+    payload: UserBulkCreate,
+    db: Session = Depends(get_db){% if cookiecutter.include_authentication == "jwt" %},
+    current_user: UserResponse = Depends(get_current_active_user){% endif %}
+):
+    """Create many users at once
+
+    Rows that clash with existing users or with each other are reported in
+    `errors` (by index into `users`) while the remaining rows are created.
+    """
+    created, errors = {{ await_ }}user_crud.create_users_bulk(db, payload.users)
+    return {"created": created, "errors": errors}
 
 
 @router.put("/{user_id}", response_model=UserResponse)
-def update_user(
+{{ async_ }}def update_user(
     user_id: int,
     user_update: UserUpdate,
     db: Session = Depends(get_db){% if cookiecutter.include_authentication == "jwt" %},
-    current_user: User = Depends(get_current_active_user){% endif %}
+    current_user: UserResponse = Depends(get_current_active_user){% endif %}
 ):
     """Update user"""
-    user = user_crud.update_user(db, user_id, user_update)
+    user = {{ await_ }}user_crud.update_user(db, user_id, user_update)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -165,13 +351,13 @@ def update_user(
 
 
 @router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_user(
+{{ async_ }}def delete_user(
     user_id: int,
     db: Session = Depends(get_db){% if cookiecutter.include_authentication == "jwt" %},
-    current_user: User = Depends(get_current_active_user){% endif %}
+    current_user: UserResponse = Depends(get_current_active_user){% endif %}
 ):
     """Delete user"""
-    if not user_crud.delete_user(db, user_id):
+    if not {{ await_ }}user_crud.delete_user(db, user_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
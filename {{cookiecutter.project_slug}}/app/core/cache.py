@@ -0,0 +1,197 @@
+{% set async_ = "async " if cookiecutter.use_async == "yes" else "" -%}
+{% set await_ = "await " if cookiecutter.use_async == "yes" else "" -%}
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional{% if cookiecutter.use_async == "yes" %}, Union{% endif %}
+
+from pydantic import TypeAdapter
+
+from app.core.config import settings
+
+# Named caches created through `create_cache`, for stats reporting
+_caches: Dict[str, "CacheBackend"] = {}
+
+
+class CacheBackend:
+    """Interface shared by cache backends; `get` returns None on a miss{% if cookiecutter.use_async == "yes" %}
+
+    Methods are coroutines, so a network backend never blocks the event loop.{% endif %}
+    """
+
+    {{ async_ }}def get(self, key: str) -> Any:
+        raise NotImplementedError
+
+    {{ async_ }}def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        raise NotImplementedError
+
+    {{ async_ }}def delete(self, *keys: str) -> None:
+        raise NotImplementedError
+
+    {{ async_ }}def clear(self) -> None:
+        raise NotImplementedError
+
+    def stats(self) -> dict:
+        raise NotImplementedError
+
+
+class MemoryCache{% if cookiecutter.use_async != "yes" %}(CacheBackend){% endif %}:
+    """In-process TTL + LRU cache bounded to `maxsize` entries"""
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None:
+                value, expires_at = item
+                if expires_at is None or expires_at > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return None
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, *keys: str) -> None:
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "backend": "memory",
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+
+{% if cookiecutter.use_async == "yes" -%}
+class SharedMemoryCache(CacheBackend):
+    """MemoryCache behind the awaitable CacheBackend interface; nothing here blocks"""
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None):
+        self._cache = MemoryCache(maxsize=maxsize, ttl=ttl)
+
+    async def get(self, key: str) -> Any:
+        return self._cache.get(key)
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        self._cache.set(key, value, ttl)
+
+    async def delete(self, *keys: str) -> None:
+        self._cache.delete(*keys)
+
+    async def clear(self) -> None:
+        self._cache.clear()
+
+    def stats(self) -> dict:
+        return self._cache.stats()
+
+
+{% endif -%}
+class RedisCache(CacheBackend):
+    """Shared cache for multi-worker deployments (requires the `redis` package)
+
+    Values are stored as JSON through a pydantic TypeAdapter for `value_type`,
+    never pickled, so whoever can write to Redis cannot run code in the
+    workers.{% if cookiecutter.use_async == "yes" %} Commands go through `redis.asyncio`.{% endif %}
+    """
+
+    def __init__(self, url: str, prefix: str, ttl: Optional[float] = None, value_type: Any = Any):
+        try:
+            {%- if cookiecutter.use_async == "yes" %}
+            from redis import asyncio as redis
+            {%- else %}
+            import redis
+            {%- endif %}
+        except ImportError as exc:
+            raise RuntimeError("CACHE_BACKEND=redis requires `pip install redis`") from exc
+        self._client = redis.Redis.from_url(url)
+        self._adapter = TypeAdapter(value_type)
+        self.prefix = prefix
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    {{ async_ }}def get(self, key: str) -> Any:
+        raw = {{ await_ }}self._client.get(self.prefix + key)
+        if raw is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return self._adapter.validate_json(raw)
+
+    {{ async_ }}def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        px = int(ttl * 1000) if ttl is not None else None
+        {{ await_ }}self._client.set(self.prefix + key, self._adapter.dump_json(value), px=px)
+
+    {{ async_ }}def delete(self, *keys: str) -> None:
+        if keys:
+            {{ await_ }}self._client.delete(*(self.prefix + key for key in keys))
+
+    {{ async_ }}def clear(self) -> None:
+        {{ async_ }}for key in self._client.scan_iter(match=self.prefix + "*"):
+            {{ await_ }}self._client.delete(key)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "backend": "redis",
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+
+def create_cache(
+    name: str, maxsize: int, ttl: Optional[float] = None, local: bool = False, value_type: Any = Any
+) -> {% if cookiecutter.use_async == "yes" %}Union[CacheBackend, MemoryCache]{% else %}CacheBackend{% endif %}:
+    """Create a named cache on the backend selected by CACHE_BACKEND
+
+    `local=True` always keeps the cache in process memory{% if cookiecutter.use_async == "yes" %} and returns a
+    MemoryCache, whose methods are plain calls rather than coroutines{% endif %}.
+    `value_type` is what Redis values are validated as when read back.
+    """
+    if local:
+        cache = MemoryCache(maxsize=maxsize, ttl=ttl)
+    elif settings.cache_backend == "redis":
+        cache = RedisCache(
+            settings.cache_redis_url, prefix=f"{settings.project_name}:{name}:", ttl=ttl, value_type=value_type
+        )
+    else:
+        cache = {% if cookiecutter.use_async == "yes" %}SharedMemoryCache{% else %}MemoryCache{% endif %}(maxsize=maxsize, ttl=ttl)
+    _caches[name] = cache
+    return cache
+
+
+def get_cache_stats() -> dict:
+    """Hit/miss statistics for every cache created through `create_cache`"""
+    return {name: cache.stats() for name, cache in _caches.items()}
@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Dict, List, Literal, Optional
 import os
 
 
@@ -11,6 +11,59 @@ class Settings(BaseSettings):
         "DATABASE_URL",
         "sqlite:///./app.db"
     )
+
+    # Database connection pool
+    db_pool_class: Literal["queue", "null", "static"] = "queue"
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+    # Compiled SQL statements cached per engine (SQLAlchemy's query_cache_size)
+    db_query_cache_size: int = 500
+    # Server-side prepared statements per connection (asyncpg, psycopg 3); 0 disables
+    db_prepared_statement_cache_size: int = 100
+    # Compile the hot CRUD statements at startup instead of on first use
+    db_warm_statement_cache: bool = False
+
+    # Read replicas (JSON list of URLs) serving read-only endpoints; empty uses the primary
+    database_read_urls: List[str] = []
+    db_replica_strategy: Literal["round_robin", "least_connections"] = "round_robin"
+    # Replicas are re-checked with SELECT 1 this often; failing ones fall back to the primary
+    db_replica_check_interval_seconds: float = 10.0
+    # Reads from a client that just committed a write stay on the primary this long; 0 disables
+    db_read_your_writes_seconds: float = 5.0
+
+    # SQLite tuning for file databases served to concurrent requests.
+    # off: rollback journal, foreign_keys only. concurrent: WAL journal,
+    # synchronous=NORMAL, larger page cache and mmap, busy timeout, in-memory
+    # temp storage, a single writer connection (DB_POOL_* are ignored for the
+    # primary) and a separate query_only reader pool for get_read_db
+    sqlite_performance_profile: Literal["off", "concurrent"] = "off"
+    sqlite_cache_size_kib: int = 65_536
+    sqlite_mmap_size: int = 268_435_456
+    sqlite_busy_timeout_ms: int = 5_000
+
+    # SQL statement logging (independent of DEBUG)
+    # off: nothing, all: every statement, sampled: 1 in N, slow: above threshold
+    sql_log_mode: Literal["off", "all", "sampled", "slow"] = "off"
+    sql_log_sample_rate: int = 100
+    sql_log_slow_threshold_ms: float = 200.0
+
+    # Per-request statement budget, counted on the session from get_db
+    # off: no counting, log: warn after the request, raise: fail the statement over budget
+    query_budget_mode: Literal["off", "log", "raise"] = "log"
+    query_budget: int = 50
+    # Budgets per route (endpoint function name) overriding QUERY_BUDGET
+    query_budgets: Dict[str, int] = {}
+    # Identical statements run this many times in one request are logged as likely N+1
+    query_repeat_threshold: int = 5
+
+    # Slow-query log, viewable at /admin/slow-queries; a size of 0 disables it
+    slow_query_threshold_ms: float = 200.0
+    slow_query_log_size: int = 100
+    # Keep bound values (in memory only) so the dashboard can EXPLAIN slow statements
+    slow_query_explain: bool = False
     
     # Application
     debug: bool = {% if cookiecutter.development_environment != "full_docker" %}True{% else %}False{% endif %}
@@ -20,6 +73,28 @@ class Settings(BaseSettings):
     
     # API Configuration
     api_v1_str: str = "/api/v1"
+    max_page_size: int = 1000
+    # Rows per uniqueness check / INSERT round trip in POST /users/bulk
+    bulk_create_chunk_size: int = 1000
+    # Rows fetched per server-side cursor batch (and per response chunk) in /users/export
+    export_batch_size: int = 1000
+    # How long an estimated X-Total-Count may be served from cache (non-PostgreSQL)
+    user_count_cache_ttl_seconds: float = 30.0
+    # Cache-Control per route (endpoint function name); routes not listed send none.
+    # ETag / Last-Modified are always sent, so "no-cache" means "revalidate with a 304"
+    cache_control: Dict[str, str] = {
+        "get_user": "private, no-cache",
+        "read_users_me": "private, no-cache",
+    }
+
+    # Caching (CACHE_BACKEND=redis shares caches between workers)
+    cache_backend: Literal["memory", "redis"] = "memory"
+    cache_redis_url: str = "redis://localhost:6379/0"
+    # Rendered GET /users/{id} and list responses. Writes made through the CRUD
+    # layer invalidate entries immediately; changes made directly in the
+    # database show up after at most this TTL. 0 disables the cache.
+    response_cache_ttl_seconds: float = 30.0
+    response_cache_max_entries: int = 10_000
     {% if cookiecutter.include_cors == "yes" -%}
     
     # CORS
@@ -35,6 +110,18 @@ class Settings(BaseSettings):
     secret_key: str = "your-secret-key-change-this-in-production"
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
+    {% if cookiecutter.include_authentication == "jwt" -%}
+    jwt_backend: Literal["python-jose", "pyjwt"] = "python-jose"
+    # Verified JWT claims cached per token until `exp`; 0 disables the cache
+    token_cache_max_entries: int = 10_000
+    password_hash_workers: int = 4
+    # Resolved principal cache. Updates and deletes made through the CRUD
+    # layer invalidate entries immediately; changes made directly in the
+    # database (e.g. deactivation) take effect after at most this TTL.
+    # 0 disables the cache.
+    auth_user_cache_ttl_seconds: float = 30.0
+    auth_user_cache_max_entries: int = 10_000
+    {% endif -%}
     {% endif -%}
     {% if cookiecutter.include_rate_limiting == "yes" -%}
     
@@ -0,0 +1,42 @@
+import csv
+import io
+import json
+from datetime import date, datetime
+from typing import Callable, Sequence, Tuple
+
+# Media type for each supported export format
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def _json_default(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def get_row_encoder(export_format: str, fields: Sequence[str]) -> Tuple[str, Callable[[Sequence], str]]:
+    """Return (header, encode) for serializing rows one at a time
+
+    `encode(row)` turns one row (values in `fields` order) into a complete
+    line, so an export never holds more than the rows currently being sent.
+    """
+    if export_format == "ndjson":
+        def encode(row: Sequence) -> str:
+            return json.dumps(dict(zip(fields, row)), default=_json_default, separators=(",", ":")) + "\n"
+        return "", encode
+
+    if export_format == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+
+        def encode(row: Sequence) -> str:
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerow(row)
+            return buffer.getvalue()
+        return encode(fields), encode
+
+    raise ValueError(f"Unsupported export format: {export_format}")
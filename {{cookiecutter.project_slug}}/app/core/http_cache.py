@@ -0,0 +1,70 @@
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Optional
+
+from fastapi import Request, Response, status
+
+from app.core.config import settings
+
+
+def _as_utc(value: datetime) -> datetime:
+    """Naive datetimes from the database are UTC (SQLite CURRENT_TIMESTAMP)"""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def make_etag(*parts) -> str:
+    """Weak ETag built from version parts; datetimes become UTC microsecond stamps
+
+    Validators are only as precise as the parts behind them. SQLite's
+    CURRENT_TIMESTAMP has one-second resolution, so two writes within a second
+    leave updated_at unchanged; include a version counter bumped on every write.
+    """
+    tokens = []
+    for part in parts:
+        if isinstance(part, datetime):
+            part = int(_as_utc(part).timestamp() * 1_000_000)
+        elif isinstance(part, (tuple, list)):
+            part = ",".join(map(str, part))
+        tokens.append("0" if part is None else str(part))
+    return 'W/"{}"'.format("-".join(tokens))
+
+
+def validator_headers(route: str, etag: str, last_modified: datetime) -> Dict[str, str]:
+    """ETag / Last-Modified headers, plus Cache-Control when configured for `route`"""
+    headers = {
+        "ETag": etag,
+        "Last-Modified": format_datetime(_as_utc(last_modified), usegmt=True),
+    }
+    cache_control = settings.cache_control.get(route)
+    if cache_control:
+        headers["Cache-Control"] = cache_control
+    return headers
+
+
+def is_not_modified(request: Request, etag: str, last_modified: datetime) -> bool:
+    """Evaluate If-None-Match (weak comparison) or, failing that, If-Modified-Since"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        opaque = etag.removeprefix("W/")
+        return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            return False
+        # HTTP dates have one-second resolution
+        return int(_as_utc(last_modified).timestamp()) <= int(since.timestamp())
+    return False
+
+
+def not_modified_response(headers: Optional[Dict[str, str]] = None) -> Response:
+    """Empty 304 carrying the current validators"""
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
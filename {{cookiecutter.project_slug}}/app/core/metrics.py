@@ -0,0 +1,133 @@
+import time
+from contextvars import ContextVar
+from typing import Callable, List, Optional
+
+from fastapi import FastAPI, Response
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, Counter, Gauge, Histogram, generate_latest
+from prometheus_client.core import GaugeMetricFamily
+from sqlalchemy import Engine, event
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.db.statement_timing import setup_statement_timing, statement_duration_ms
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route"],
+)
+REQUESTS = Counter(
+    "http_requests",
+    "HTTP responses by route template and status code",
+    ["method", "route", "status"],
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "HTTP requests currently being served",
+)
+REQUEST_QUERIES = Histogram(
+    "http_request_db_queries",
+    "Database statements executed per HTTP request",
+    ["method", "route"],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, float("inf")),
+)
+QUERY_DURATION = Histogram(
+    "db_query_duration_seconds",
+    "Database statement execution time",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, float("inf")),
+)
+
+# Statement count of the request being served; a one-item list so that
+# sync endpoints running in the threadpool update the same counter
+_request_queries: ContextVar[Optional[List[int]]] = ContextVar("request_queries", default=None)
+
+
+def _route_template(scope: Scope) -> str:
+    """Path template of the route matching `scope` (e.g. /api/v1/users/{user_id})
+
+    Labelling by template rather than raw path keeps series cardinality bounded.
+    """
+    partial = None
+    for route in scope["app"].router.routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route.path
+        if match == Match.PARTIAL and partial is None:
+            partial = route.path
+    return partial or "unmatched"
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency, status, in-flight and per-request query metrics"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        route = _route_template(scope)
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        queries = [0]
+        token = _request_queries.set(queries)
+        REQUESTS_IN_PROGRESS.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            REQUEST_DURATION.labels(method, route).observe(time.perf_counter() - start)
+            REQUESTS.labels(method, route, str(status_code)).inc()
+            REQUEST_QUERIES.labels(method, route).observe(queries[0])
+            REQUESTS_IN_PROGRESS.dec()
+            _request_queries.reset(token)
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Observe the duration of every statement executed on `engine` and count it against the current request"""
+    setup_statement_timing(engine)
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _observe_query(conn, cursor, statement, parameters, context, executemany):
+        QUERY_DURATION.observe(statement_duration_ms(conn) / 1000)
+        queries = _request_queries.get()
+        if queries is not None:
+            queries[0] += 1
+
+
+class PoolCollector:
+    """Connection pool gauges, read from `get_status` at scrape time"""
+
+    def __init__(self, get_status: Callable[[], dict]):
+        self.get_status = get_status
+
+    def collect(self):
+        status = self.get_status()
+        pool_class = status["pool_class"]
+        for key in ("size", "checked_in", "checked_out", "overflow", "max_overflow", "waiters"):
+            if key in status:
+                gauge = GaugeMetricFamily(
+                    f"db_pool_{key}", f"Connection pool {key.replace('_', ' ')}", labels=["pool_class"]
+                )
+                gauge.add_metric([pool_class], status[key])
+                yield gauge
+
+
+def setup_metrics(app: FastAPI, get_pool_status: Callable[[], dict]) -> None:
+    """Instrument `app` and serve every metric from GET /metrics"""
+    app.add_middleware(MetricsMiddleware)
+    REGISTRY.register(PoolCollector(get_pool_status))
+
+    @app.get("/metrics", include_in_schema=False)
+    def metrics():
+        """Metrics in the Prometheus text exposition format"""
+        return Response(content=generate_latest(REGISTRY), media_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,18 @@
+import base64
+import json
+
+
+def encode_cursor(last_id: int) -> str:
+    """Encode the last seen primary key as an opaque pagination cursor"""
+    payload = json.dumps({"id": last_id}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    """Decode a cursor produced by `encode_cursor`, raising ValueError if malformed"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded))
+        return int(payload["id"])
+    except (ValueError, KeyError, TypeError) as exc:
+        raise ValueError("Invalid pagination cursor") from exc
@@ -0,0 +1,93 @@
+{% set async_ = "async " if cookiecutter.use_async == "yes" else "" -%}
+{% set await_ = "await " if cookiecutter.use_async == "yes" else "" -%}
+import uuid
+from datetime import datetime
+from typing import Dict, NamedTuple, Optional
+from urllib.parse import urlencode
+
+from fastapi import Request, Response
+
+from app.core.cache import create_cache
+from app.core.config import settings
+
+
+class CachedResponse(NamedTuple):
+    """Serialized JSON body of a 200 response with its headers"""
+    content: bytes
+    headers: Dict[str, str]
+    last_modified: Optional[datetime] = None
+
+    def to_response(self) -> Response:
+        return Response(content=self.content, media_type="application/json", headers=self.headers)
+
+
+# Rendered responses; `/admin/cache` reports their hit ratio under "responses"
+_responses = create_cache(
+    "responses",
+    maxsize=settings.response_cache_max_entries,
+    ttl=settings.response_cache_ttl_seconds,
+    value_type=CachedResponse,
+)
+# Current generation token per resource listing and per item. Keys in
+# `_responses` embed the token, so dropping it orphans every cached variant
+# at once; orphans age out through LRU / TTL.
+_generations = create_cache(
+    "response_generations",
+    maxsize=settings.response_cache_max_entries,
+    ttl=settings.response_cache_ttl_seconds,
+    value_type=str,
+)
+
+
+def _enabled() -> bool:
+    return settings.response_cache_ttl_seconds > 0
+
+
+{{ async_ }}def _generation(scope: str) -> str:
+    token = {{ await_ }}_generations.get(scope)
+    if token is None:
+        token = uuid.uuid4().hex
+        {{ await_ }}_generations.set(scope, token)
+    return token
+
+
+def query_variant(request: Request) -> str:
+    """Query string with parameters sorted, so equivalent URLs share an entry"""
+    return urlencode(sorted(request.query_params.multi_items()))
+
+
+{{ async_ }}def cache_key(resource: str, item_id: Optional[int] = None, variant: str = "") -> Optional[str]:
+    """Key for a listing (or one item) of `resource` at its current generation
+
+    Take the key before reading the database and store under that same key:
+    a write committed in between drops the generation, so a stale body lands
+    where no later lookup goes. Returns None when the cache is disabled.
+    """
+    if not _enabled():
+        return None
+    scope = resource if item_id is None else f"{resource}:{item_id}"
+    generation = {{ await_ }}_generation(scope)
+    return f"{scope}:{generation}:{variant}"
+
+
+{{ async_ }}def lookup(key: Optional[str]) -> Optional[CachedResponse]:
+    """Cached response for `key`, or None on a miss"""
+    if key is None:
+        return None
+    return {{ await_ }}_responses.get(key)
+
+
+{{ async_ }}def store(key: Optional[str], cached: CachedResponse) -> None:
+    if key is not None:
+        {{ await_ }}_responses.set(key, cached)
+
+
+{{ async_ }}def invalidate(resource: str, item_id: Optional[int] = None) -> None:
+    """Drop cached listings of `resource` and, given `item_id`, every variant of that item"""
+    scopes = [resource] if item_id is None else [resource, f"{resource}:{item_id}"]
+    {{ await_ }}_generations.delete(*scopes)
+
+
+{{ async_ }}def clear() -> None:
+    {{ await_ }}_responses.clear()
+    {{ await_ }}_generations.clear()
@@ -0,0 +1,40 @@
+{% if cookiecutter.json_response != "stdlib" -%}
+from typing import Any
+
+{% if cookiecutter.json_response == "orjson" -%}
+import orjson
+{% else -%}
+import msgspec
+{% endif -%}
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+
+def _encode_default(value: Any) -> Any:
+    """Fallback for values the encoder does not handle natively"""
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+{% if cookiecutter.json_response == "msgspec" -%}
+_encoder = msgspec.json.Encoder(enc_hook=_encode_default)
+
+
+{% endif -%}
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with {{ cookiecutter.json_response }} instead of the stdlib `json` module
+
+    FastAPI hands `render` the response model already converted to plain data,
+    so this speeds up encoding only. The hot user list and detail endpoints
+    skip it and return bodies pre-serialized by pydantic-core
+    (see `projected_response`).
+    """
+
+    def render(self, content: Any) -> bytes:
+        {% if cookiecutter.json_response == "orjson" -%}
+        return orjson.dumps(content, default=_encode_default, option=orjson.OPT_NON_STR_KEYS)
+        {% else -%}
+        return _encoder.encode(content)
+        {% endif -%}
+{% endif -%}
@@ -0,0 +1,164 @@
+{% if cookiecutter.include_authentication == "jwt" -%}
+import asyncio
+import hashlib
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, List, Tuple
+
+from passlib.context import CryptContext
+from app.core.cache import create_cache
+from app.core.config import settings
+
+# Password hashing context
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+# bcrypt is deliberately slow, so hashing runs on a small dedicated pool that
+# bounds how many hashes run at once to PASSWORD_HASH_WORKERS. The *_async
+# helpers await the pool without blocking the event loop; the plain helpers
+# still block their calling thread until the hash is done.
+_hash_executor = ThreadPoolExecutor(
+    max_workers=settings.password_hash_workers,
+    thread_name_prefix="password-hash",
+)
+_stats_lock = threading.Lock()
+_submitted = 0
+_completed = 0
+
+
+def _on_done(future: Future) -> None:
+    global _completed
+    with _stats_lock:
+        _completed += 1
+
+
+def _submit(fn: Callable, *args) -> Future:
+    """Run `fn(*args)` on the password hashing pool, tracking queue depth"""
+    global _submitted
+    with _stats_lock:
+        _submitted += 1
+    future = _hash_executor.submit(fn, *args)
+    future.add_done_callback(_on_done)
+    return future
+
+
+def get_hash_pool_stats() -> dict:
+    """Password hashing pool occupancy (in-flight = running + queued)"""
+    with _stats_lock:
+        in_flight = _submitted - _completed
+    workers = settings.password_hash_workers
+    return {
+        "workers": workers,
+        "in_flight": in_flight,
+        "queued": max(in_flight - workers, 0),
+        "completed": _completed,
+    }
+
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password against its hash"""
+    return _submit(pwd_context.verify, plain_password, hashed_password).result()
+
+
+def get_password_hash(password: str) -> str:
+    """Hash a password"""
+    return _submit(pwd_context.hash, password).result()
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password against its hash without blocking the event loop"""
+    return await asyncio.wrap_future(_submit(pwd_context.verify, plain_password, hashed_password))
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password without blocking the event loop"""
+    return await asyncio.wrap_future(_submit(pwd_context.hash, password))
+
+
+def get_password_hashes(passwords: List[str]) -> List[str]:
+    """Hash a batch of passwords in parallel across the hashing pool"""
+    futures = [_submit(pwd_context.hash, password) for password in passwords]
+    return [future.result() for future in futures]
+
+
+async def get_password_hashes_async(passwords: List[str]) -> List[str]:
+    """Hash a batch of passwords in parallel without blocking the event loop"""
+    futures = [asyncio.wrap_future(_submit(pwd_context.hash, password)) for password in passwords]
+    return list(await asyncio.gather(*futures))
+
+
+class InvalidTokenError(Exception):
+    """Raised when a JWT fails signature, expiry or format validation"""
+
+
+def _jose_backend() -> Tuple[Callable, Callable]:
+    from jose import JWTError, jwt
+
+    def encode(claims: dict) -> str:
+        return jwt.encode(claims, settings.secret_key, algorithm=settings.algorithm)
+
+    def decode(token: str) -> dict:
+        try:
+            return jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
+        except JWTError as exc:
+            raise InvalidTokenError(str(exc)) from exc
+
+    return encode, decode
+
+
+def _pyjwt_backend() -> Tuple[Callable, Callable]:
+    import jwt
+
+    def encode(claims: dict) -> str:
+        return jwt.encode(claims, settings.secret_key, algorithm=settings.algorithm)
+
+    def decode(token: str) -> dict:
+        try:
+            return jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
+        except jwt.PyJWTError as exc:
+            raise InvalidTokenError(str(exc)) from exc
+
+    return encode, decode
+
+
+JWT_BACKENDS = {
+    "python-jose": _jose_backend,
+    "pyjwt": _pyjwt_backend,
+}
+
+
+def get_jwt_backend(name: str) -> Tuple[Callable, Callable]:
+    """Return the (encode, decode) pair for a JWT library"""
+    return JWT_BACKENDS[name]()
+
+
+_encode_token, _decode_token = get_jwt_backend(settings.jwt_backend)
+
+# Verified claims keyed by token digest; always per process, since a shared
+# store would hand out claims that were never verified locally
+_token_cache = create_cache("tokens", maxsize=settings.token_cache_max_entries, local=True)
+
+
+def encode_access_token(claims: dict) -> str:
+    """Sign `claims` as a JWT"""
+    return _encode_token(claims)
+
+
+def decode_access_token(token: str) -> dict:
+    """Verify and decode a JWT, reusing cached claims for repeat tokens until `exp`"""
+    if settings.token_cache_max_entries <= 0:
+        return _decode_token(token)
+
+    key = hashlib.sha256(token.encode()).hexdigest()
+    claims = _token_cache.get(key)
+    if claims is not None:
+        return claims
+
+    claims = _decode_token(token)
+    exp = claims.get("exp")
+    if exp is not None:
+        ttl = exp - time.time()
+        if ttl > 0:
+            _token_cache.set(key, claims, ttl=ttl)
+    return claims
+{% endif -%}
@@ -4,27 +4,43 @@ Import all CRUD operations here
 """
 {% if cookiecutter.include_user_model == "yes" -%}
 from .user import (
+    DuplicateUserError,
     get_user,
+    get_user_version,
     get_user_by_email,
     {% if cookiecutter.include_authentication == "jwt" -%}
     get_user_by_username,
     authenticate_user,
+    get_principal,
+    invalidate_principal,
     {% endif -%}
     get_users,
+    users_query,
+    count_users,
+    stream_users,
     create_user,
+    create_users_bulk,
     update_user,
     delete_user,
 )
 
 __all__ = [
+    "DuplicateUserError",
     "get_user",
+    "get_user_version",
     "get_user_by_email",
     {% if cookiecutter.include_authentication == "jwt" -%}
     "get_user_by_username",
     "authenticate_user",
+    "get_principal",
+    "invalidate_principal",
     {% endif -%}
     "get_users",
+    "users_query",
+    "count_users",
+    "stream_users",
     "create_user",
+    "create_users_bulk",
     "update_user",
     "delete_user",
 ]
@@ -1,107 +1,558 @@
 {% if cookiecutter.include_user_model == "yes" -%}
+{% set async_ = "async " if cookiecutter.use_async == "yes" else "" -%}
+{% set await_ = "await " if cookiecutter.use_async == "yes" else "" -%}
+{% set async_suffix = "_async" if cookiecutter.use_async == "yes" else "" -%}
+{% if cookiecutter.use_async == "yes" -%}
+from sqlalchemy.ext.asyncio import AsyncSession as Session
+{% else -%}
 from sqlalchemy.orm import Session
-from sqlalchemy import select
-from typing import List, Optional
+{% endif -%}
+from sqlalchemy import bindparam, delete, func, insert, or_, select, text, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.engine import Row
+import sys
 {% if cookiecutter.include_authentication == "jwt" -%}
-from passlib.context import CryptContext
+import uuid
 {% endif -%}
+from functools import lru_cache
+from typing import {% if cookiecutter.use_async == "yes" %}AsyncIterator{% else %}Iterator{% endif %}, Dict, List, Optional, Sequence, Set, Tuple, Union
 from app.models.user import User
-from app.schemas.user import UserCreate, UserUpdate
-
+from app.core.cache import create_cache
+from app.core.config import settings
+from app.core.response_cache import invalidate as invalidate_responses
+from app.schemas.user import UserBulkError, UserCreate, UserFilter, UserResponse, UserUpdate
 {% if cookiecutter.include_authentication == "jwt" -%}
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from app.core.security import (
+    get_password_hash{{ async_suffix }},
+    get_password_hashes{{ async_suffix }},
+    verify_password{{ async_suffix }},
+)
+
+# Columns with a UNIQUE constraint, checked up front by create_users_bulk
+UNIQUE_FIELDS = ("email", "username")
+
+# Resolved principals keyed by JWT subject and its current generation token.
+# Writes drop the username's token, so every cached principal for it, and
+# any stale one a concurrent lookup is still about to store, goes unread.
+_principal_cache = create_cache(
+    "principals",
+    maxsize=settings.auth_user_cache_max_entries,
+    ttl=settings.auth_user_cache_ttl_seconds,
+    value_type=UserResponse,
+)
+_principal_generations = create_cache(
+    "principal_generations",
+    maxsize=settings.auth_user_cache_max_entries,
+    ttl=settings.auth_user_cache_ttl_seconds,
+    value_type=str,
+)
+{% else -%}
+# Columns with a UNIQUE constraint, checked up front by create_users_bulk
+UNIQUE_FIELDS = ("email",)
+{% endif %}
+# Columns served by the export, in output order (never includes secrets)
+EXPORT_FIELDS = tuple(UserResponse.model_fields)
+
+# Sort keys accepted by get_users ("-" prefix for descending) and the ORDER BY
+# columns behind each; every one is served by an index, so listing never
+# sorts the table. Unique columns need no id tie-breaker.
+SORT_KEYS = {
+    "id": (User.id,),
+    "created_at": (User.created_at, User.id),
+    "name": (User.name, User.id),
+    "email": (User.email,),
+}
+
+# count(*) result behind estimated user counts where no planner estimate exists
+_count_cache = create_cache("user_count", maxsize=1, ttl=settings.user_count_cache_ttl_seconds, value_type=int)
+
+
+class DuplicateUserError(Exception):
+    """Raised when a write violates the unique constraint on one of UNIQUE_FIELDS"""
+
+    def __init__(self, field: str):
+        super().__init__(f"User with this {field} already exists")
+        self.field = field
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a password against its hash"""
-    return pwd_context.verify(plain_password, hashed_password)
+def _duplicate_field(exc: IntegrityError) -> Optional[str]:
+    """The UNIQUE_FIELDS column an IntegrityError was raised for, if any"""
+    message = str(exc.orig)
+    for field in UNIQUE_FIELDS:
+        # SQLite: "UNIQUE constraint failed: users.email"
+        # PostgreSQL: 'unique constraint "ix_users_email"' / "Key (email)=(...)"
+        if f"users.{field}" in message or f"users_{field}" in message or f"({field})=" in message:
+            return field
+    return None
 
 
-def get_password_hash(password: str) -> str:
-    """Hash a password"""
-    return pwd_context.hash(password)
+def _selectable(fields: Optional[Sequence[str]] = None) -> list:
+    """The User entity, or just the columns named in `fields` (fetched as Core rows)"""
+    if fields:
+        return [getattr(User, field) for field in fields]
+    return [User]
+
+
+# Hot statements, built once at import with the per-call values as bound
+# parameters. Reusing the same statement object skips rebuilding it and
+# memoizes its compiled-cache key, so each call goes straight to the
+# engine's compiled cache (DB_QUERY_CACHE_SIZE) and, on asyncpg / psycopg 3,
+# to the connection's server-side prepared statement.
+_USER_BY_ID = select(User).where(User.id == bindparam("user_id"))
+_USER_BY_EMAIL = select(User).where(User.email == bindparam("email"))
+{% if cookiecutter.include_authentication == "jwt" -%}
+_USER_BY_USERNAME = select(User).where(User.username == bindparam("username"))
 {% endif -%}
+_USER_VERSION = select(User.created_at, User.updated_at, User.version).where(User.id == bindparam("user_id"))
+
+
+@lru_cache(maxsize=128)
+def _user_columns_by_id(fields: Tuple[str, ...]):
+    """Prebuilt SELECT of `fields` columns for one user, one per sparse fieldset"""
+    return select(*_selectable(fields)).where(User.id == bindparam("user_id"))
 
 
-def get_user(db: Session, user_id: int) -> Optional[User]:
-    """Get user by ID"""
-    return db.scalar(select(User).where(User.id == user_id))
+{{ async_ }}def get_user(
+    db: Session, user_id: int, fields: Optional[Sequence[str]] = None
+) -> Union[User, Row, None]:
+    """Get user by ID; with `fields`, a Core row of only those columns"""
+    if fields:
+        result = {{ await_ }}db.execute(_user_columns_by_id(tuple(fields)), {"user_id": user_id})
+        return result.first()
+    return {{ await_ }}db.scalar(_USER_BY_ID, {"user_id": user_id})
 
 
-def get_user_by_email(db: Session, email: str) -> Optional[User]:
+{{ async_ }}def get_user_by_email(db: Session, email: str) -> Optional[User]:
     """Get user by email"""
-    return db.scalar(select(User).where(User.email == email))
+    return {{ await_ }}db.scalar(_USER_BY_EMAIL, {"email": email})
 
 
 {% if cookiecutter.include_authentication == "jwt" -%}
-def get_user_by_username(db: Session, username: str) -> Optional[User]:
+{{ async_ }}def get_user_by_username(db: Session, username: str) -> Optional[User]:
     """Get user by username"""
-    return db.scalar(select(User).where(User.username == username))
+    return {{ await_ }}db.scalar(_USER_BY_USERNAME, {"username": username})
 
 
-def authenticate_user(db: Session, username: str, password: str) -> Optional[User]:
+{{ async_ }}def authenticate_user(db: Session, username: str, password: str) -> Optional[User]:
     """Authenticate user with username and password"""
-    user = get_user_by_username(db, username)
+    user = {{ await_ }}get_user_by_username(db, username)
     if not user:
         return None
-    if not verify_password(password, user.hashed_password):
+    if not {{ await_ }}verify_password{{ async_suffix }}(password, user.hashed_password):
         return None
     return user
+
+
+{{ async_ }}def get_principal(db: Session, username: str) -> Optional[UserResponse]:
+    """Resolve the authenticated user for a JWT subject, through the principal cache
+
+    A cached principal may report `is_active` up to AUTH_USER_CACHE_TTL_SECONDS
+    stale when the row is changed outside `update_user` / `delete_user`.
+    """
+    cache_enabled = settings.auth_user_cache_ttl_seconds > 0
+    if cache_enabled:
+        # Take the key before reading the row, as response_cache.cache_key does
+        generation = {{ await_ }}_principal_generation(username)
+        key = f"sub:{username}:{generation}"
+        principal = {{ await_ }}_principal_cache.get(key)
+        if principal is not None:
+            return principal
+
+    user = {{ await_ }}get_user_by_username(db, username)
+    if user is None:
+        return None
+    principal = UserResponse.model_validate(user)
+    if cache_enabled:
+        {{ await_ }}_principal_cache.set(key, principal)
+    return principal
+
+
+{{ async_ }}def _principal_generation(username: str) -> str:
+    token = {{ await_ }}_principal_generations.get(username)
+    if token is None:
+        token = uuid.uuid4().hex
+        {{ await_ }}_principal_generations.set(username, token)
+    return token
+
+
+{{ async_ }}def invalidate_principal(*usernames: str) -> None:
+    """Stop serving cached principals for `usernames`"""
+    {{ await_ }}_principal_generations.delete(*usernames)
 {% endif -%}
 
 
-def get_users(db: Session, skip: int = 0, limit: int = 100) -> List[User]:
-    """Get all users with pagination"""
-    return db.scalars(select(User).offset(skip).limit(limit)).all()
+def _prefix_conditions(column, prefix: str) -> list:
+    """Prefix match as a range predicate that a plain B-tree index can serve"""
+    conditions = [column >= prefix, column.startswith(prefix, autoescape=True)]
+    if ord(prefix[-1]) < sys.maxunicode:
+        conditions.append(column < prefix[:-1] + chr(ord(prefix[-1]) + 1))
+    return conditions
+
+
+def _filter_conditions(filters: Optional[UserFilter]) -> list:
+    """WHERE conditions for the filters that are set"""
+    if filters is None:
+        return []
+    conditions = []
+    if filters.is_active is not None:
+        conditions.append(User.is_active == filters.is_active)
+    if filters.created_after is not None:
+        conditions.append(User.created_at >= filters.created_after)
+    if filters.created_before is not None:
+        conditions.append(User.created_at < filters.created_before)
+    if filters.email_prefix:
+        conditions.extend(_prefix_conditions(User.email, filters.email_prefix))
+    if filters.name_prefix:
+        conditions.extend(_prefix_conditions(User.name, filters.name_prefix))
+    return conditions
+
+
+{{ async_ }}def get_user_version(db: Session, user_id: int) -> Optional[Row]:
+    """(created_at, updated_at, version) of a user, for HTTP validators, without loading the row"""
+    result = {{ await_ }}db.execute(_USER_VERSION, {"user_id": user_id})
+    return result.first()
+
+
+{{ async_ }}def warm_statement_cache(db: Session) -> int:
+    """Run each prebuilt read statement once, with values matching no row
+
+    Compiles them into the engine's compiled cache (and prepares them on this
+    connection where the driver supports it) ahead of the first request.
+    Returns the number of statements run.
+    """
+    warm_ups = [
+        (_USER_BY_ID, {"user_id": 0}),
+        (_user_columns_by_id(EXPORT_FIELDS), {"user_id": 0}),
+        (_USER_VERSION, {"user_id": 0}),
+        (_USER_BY_EMAIL, {"email": ""}),
+        {% if cookiecutter.include_authentication == "jwt" -%}
+        (_USER_BY_USERNAME, {"username": ""}),
+        {% endif -%}
+    ]
+    for stmt, params in warm_ups:
+        {{ await_ }}db.execute(stmt, params)
+    {{ await_ }}db.rollback()
+    return len(warm_ups)
+
+
+def users_query(
+    filters: Optional[UserFilter] = None, sort: str = "id", fields: Optional[Sequence[str]] = None
+):
+    """SELECT of users (or only `fields` columns) matching `filters`, ordered by `sort`
+
+    Raises ValueError for a sort key outside SORT_KEYS.
+    """
+    descending = sort.startswith("-")
+    columns = SORT_KEYS.get(sort[1:] if descending else sort)
+    if columns is None:
+        choices = ", ".join(f"{key}, -{key}" for key in SORT_KEYS)
+        raise ValueError(f"Unsupported sort key '{sort}'; use one of: {choices}")
+    order_by = [column.desc() if descending else column for column in columns]
+    return select(*_selectable(fields)).where(*_filter_conditions(filters)).order_by(*order_by)
+
+
+{{ async_ }}def get_users(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    after_id: Optional[int] = None,
+    filters: Optional[UserFilter] = None,
+    sort: str = "id",
+    fields: Optional[Sequence[str]] = None,
+) -> List[Union[User, Row]]:
+    """Get users matching `filters` ordered by `sort`, paginated by offset (skip) or keyset (after_id)
 
+    Keyset pagination follows the ID order, so `after_id` requires sort "id" or "-id".
+    With `fields`, returns Core rows of only those columns instead of ORM
+    objects, skipping identity-map bookkeeping and unrequested columns.
+    """
+    stmt = users_query(filters, sort, fields).limit(limit)
+    if after_id is not None:
+        if sort not in ("id", "-id"):
+            raise ValueError("Cursor pagination requires sort=id or sort=-id")
+        stmt = stmt.where(User.id < after_id if sort == "-id" else User.id > after_id)
+    else:
+        stmt = stmt.offset(skip)
+    if fields:
+        result = {{ await_ }}db.execute(stmt)
+    else:
+        result = {{ await_ }}db.scalars(stmt)
+    return result.all()
 
-def create_user(db: Session, user: UserCreate) -> User:
-    """Create new user"""
+
+{{ async_ }}def count_users(db: Session, exact: bool = False, filters: Optional[UserFilter] = None) -> int:
+    """Total number of users, estimated unless `exact` is set
+
+    PostgreSQL estimates come from the planner statistics in pg_class (kept
+    current by autovacuum / ANALYZE); elsewhere the estimate is a count(*)
+    cached for USER_COUNT_CACHE_TTL_SECONDS. `exact=True` always scans.
+    Counts restricted by `filters` are always exact.
+    """
+    conditions = _filter_conditions(filters)
+    if conditions:
+        return {{ await_ }}db.scalar(select(func.count()).select_from(User).where(*conditions))
+
+    if not exact:
+        if db.get_bind().dialect.name == "postgresql":
+            estimate = {{ await_ }}db.scalar(
+                text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)"),
+                {"table": User.__tablename__},
+            )
+            # reltuples is -1 until the table has been vacuumed or analyzed
+            if estimate is not None and estimate >= 0:
+                return estimate
+        total = {{ await_ }}_count_cache.get("total")
+        if total is not None:
+            return total
+
+    total = {{ await_ }}db.scalar(select(func.count()).select_from(User))
+    {{ await_ }}_count_cache.set("total", total)
+    return total
+
+
+{{ async_ }}def stream_users(db: Session, batch_size: Optional[int] = None) -> {% if cookiecutter.use_async == "yes" %}AsyncIterator{% else %}Iterator{% endif %}[Row]:
+    """Yield every user ordered by ID as a plain row of EXPORT_FIELDS
+
+    Rows come through a server-side cursor `batch_size` at a time and skip the
+    ORM identity map, so memory stays flat however large the table is.
+    """
+    stmt = (
+        select(*(getattr(User, field) for field in EXPORT_FIELDS))
+        .order_by(User.id)
+        .execution_options(yield_per=batch_size or settings.export_batch_size)
+    )
+    {%- if cookiecutter.use_async == "yes" %}
+    result = await db.stream(stmt)
+    async for row in result:
+        yield row
+    {%- else %}
+    for row in db.execute(stmt):
+        yield row
+    {%- endif %}
+
+
+{{ async_ }}def create_user(db: Session, user: UserCreate) -> User:
+    """Create new user, relying on the unique indexes instead of pre-check SELECTs
+
+    Raises DuplicateUserError when the email{% if cookiecutter.include_authentication == "jwt" %} or username{% endif %} is already taken,
+    including when a concurrent request wins the race for it.
+    """
     user_data = user.model_dump()
     {% if cookiecutter.include_authentication == "jwt" -%}
     # Hash the password
     if "password" in user_data:
-        hashed_password = get_password_hash(user_data.pop("password"))
+        hashed_password = {{ await_ }}get_password_hash{{ async_suffix }}(user_data.pop("password"))
         user_data["hashed_password"] = hashed_password
     {% endif -%}
-    
+
     db_user = User(**user_data)
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    try:
+        {{ await_ }}db.commit()
+    except IntegrityError as exc:
+        {{ await_ }}db.rollback()
+        field = _duplicate_field(exc)
+        if field is None:
+            raise
+        raise DuplicateUserError(field) from exc
+    {{ await_ }}invalidate_responses("users")
+    {{ await_ }}db.refresh(db_user)
     return db_user
 
 
-def update_user(db: Session, user_id: int, user_update: UserUpdate) -> Optional[User]:
-    """Update user"""
-    db_user = get_user(db, user_id)
-    if not db_user:
-        return None
-    
+{{ async_ }}def _create_users_chunk(
+    db: Session,
+    chunk: List[Tuple[int, UserCreate]],
+    seen: Dict[str, Set[str]],
+    errors: List[UserBulkError],
+    {%- if cookiecutter.include_authentication == "jwt" %}
+    hashes: Dict[int, str],
+    {%- endif %}
+) -> List[int]:
+    """Check, hash and INSERT one chunk of a bulk create; returns the new IDs{% if cookiecutter.include_authentication == "jwt" %}
+
+    Password hashes are kept in `hashes` by row index, so a retry of the
+    chunk reuses them.{% endif %}
+    """
+    # One SELECT finds every value in the chunk that is already taken
+    result = {{ await_ }}db.execute(
+        select(*(getattr(User, field) for field in UNIQUE_FIELDS)).where(
+            or_(*(
+                getattr(User, field).in_({getattr(user, field) for _, user in chunk})
+                for field in UNIQUE_FIELDS
+            ))
+        )
+    )
+    taken = {field: set() for field in UNIQUE_FIELDS}
+    for row in result:
+        for field, value in zip(UNIQUE_FIELDS, row):
+            taken[field].add(value)
+
+    chunk_seen = {field: set() for field in UNIQUE_FIELDS}
+    accepted = []
+    for index, user in chunk:
+        for field in UNIQUE_FIELDS:
+            value = getattr(user, field)
+            if value in taken[field]:
+                errors.append(UserBulkError(index=index, field=field, detail=f"User with this {field} already exists"))
+                break
+            if value in seen[field] or value in chunk_seen[field]:
+                errors.append(UserBulkError(index=index, field=field, detail=f"Duplicate {field} within the batch"))
+                break
+        else:
+            for field in UNIQUE_FIELDS:
+                chunk_seen[field].add(getattr(user, field))
+            accepted.append((index, user))
+    {%- if cookiecutter.include_authentication == "jwt" %}
+    # End the check's transaction so no pooled connection sits idle in it
+    # while bcrypt runs; a value taken meanwhile fails the INSERT and the
+    # caller retries the chunk
+    {{ await_ }}db.rollback()
+    {%- endif %}
+    if not accepted:
+        return []
+    {%- if cookiecutter.include_authentication == "jwt" %}
+
+    unhashed = [(index, user.password) for index, user in accepted if index not in hashes]
+    hashed_passwords = {{ await_ }}get_password_hashes{{ async_suffix }}([password for _, password in unhashed])
+    hashes.update(zip((index for index, _ in unhashed), hashed_passwords))
+    rows = []
+    for index, user in accepted:
+        row = user.model_dump(exclude={"password"})
+        row["hashed_password"] = hashes[index]
+        rows.append(row)
+    {%- else %}
+
+    rows = [user.model_dump() for _, user in accepted]
+    {%- endif %}
+
+    if db.get_bind().dialect.insert_executemany_returning_sort_by_parameter_order:
+        result = {{ await_ }}db.scalars(insert(User).returning(User.id, sort_by_parameter_order=True), rows)
+        ids = list(result.all())
+    else:
+        # Fallback for dialects without ordered executemany RETURNING
+        {{ await_ }}db.execute(insert(User), rows)
+        result = {{ await_ }}db.execute(
+            select(User.email, User.id).where(User.email.in_([row["email"] for row in rows]))
+        )
+        ids_by_email = dict(result.all())
+        ids = [ids_by_email[row["email"]] for row in rows]
+    {{ await_ }}db.commit()
+    {{ await_ }}invalidate_responses("users")
+
+    for field in UNIQUE_FIELDS:
+        seen[field] |= chunk_seen[field]
+    return ids
+
+
+{{ async_ }}def create_users_bulk(
+    db: Session, users: List[UserCreate], chunk_size: Optional[int] = None
+) -> Tuple[List[int], List[UserBulkError]]:
+    """Create many users, committing chunk by chunk and reporting rejected rows
+
+    Each chunk costs one uniqueness SELECT, one parallel hashing pass (run
+    outside any transaction), one batched INSERT ... RETURNING and one commit. Rows clashing with existing
+    users or with an earlier row of the batch are skipped and reported by
+    their index in `users`; the rest of the batch is still created.
+    """
+    chunk_size = chunk_size or settings.bulk_create_chunk_size
+    created: List[int] = []
+    errors: List[UserBulkError] = []
+    seen = {field: set() for field in UNIQUE_FIELDS}
+    {%- if cookiecutter.include_authentication == "jwt" %}
+    hashes: Dict[int, str] = {}
+    {%- endif %}
+    indexed = list(enumerate(users))
+    for start in range(0, len(indexed), chunk_size):
+        chunk = indexed[start:start + chunk_size]
+        chunk_errors: List[UserBulkError] = []
+        try:
+            ids = {{ await_ }}_create_users_chunk(db, chunk, seen, chunk_errors{% if cookiecutter.include_authentication == "jwt" %}, hashes{% endif %})
+        except IntegrityError:
+            # A concurrent writer took a value between the check and the INSERT;
+            # retry once so the uniqueness SELECT reports the clashing rows
+            {{ await_ }}db.rollback()
+            chunk_errors = []
+            ids = {{ await_ }}_create_users_chunk(db, chunk, seen, chunk_errors{% if cookiecutter.include_authentication == "jwt" %}, hashes{% endif %})
+        created.extend(ids)
+        errors.extend(chunk_errors)
+    return created, errors
+
+
+{{ async_ }}def update_user(db: Session, user_id: int, user_update: UserUpdate) -> Optional[User]:
+    """Update user with a single UPDATE ... RETURNING where the dialect supports it"""
     update_data = user_update.model_dump(exclude_unset=True)
     {% if cookiecutter.include_authentication == "jwt" -%}
     # Hash the password if provided
     if "password" in update_data:
-        hashed_password = get_password_hash(update_data.pop("password"))
+        hashed_password = {{ await_ }}get_password_hash{{ async_suffix }}(update_data.pop("password"))
         update_data["hashed_password"] = hashed_password
     {% endif -%}
-    
-    for field, value in update_data.items():
-        setattr(db_user, field, value)
-    
-    db.commit()
-    db.refresh(db_user)
+
+    if not update_data:
+        return {{ await_ }}get_user(db, user_id)
+
+    # Detach any identity-mapped copy (e.g. the current user) so the updated
+    # row is loaded into a fresh instance instead of a stale one
+    cached_user = db.identity_map.get(db.identity_key(User, user_id))
+    if cached_user is not None:
+        db.expunge(cached_user)
+    {%- if cookiecutter.include_authentication == "jwt" %}
+    # A rename leaves principals cached under the old JWT subject as well
+    usernames = set()
+    if "username" in update_data:
+        old_username = {{ await_ }}db.scalar(select(User.username).where(User.id == user_id))
+        usernames.add(old_username)
+    {%- endif %}
+
+    stmt = update(User).where(User.id == user_id).values(**update_data)
+    sync_options = {"synchronize_session": False}
+    if db.get_bind().dialect.update_returning:
+        db_user = {{ await_ }}db.scalar(stmt.returning(User), execution_options=sync_options)
+    else:
+        # Fallback for dialects without RETURNING: UPDATE, then re-read the row
+        result = {{ await_ }}db.execute(stmt, execution_options=sync_options)
+        db_user = {{ await_ }}get_user(db, user_id) if result.rowcount else None
+
+    {{ await_ }}db.commit()
+    {{ await_ }}invalidate_responses("users", user_id)
+    {% if cookiecutter.include_authentication == "jwt" -%}
+    if db_user is not None:
+        usernames.add(db_user.username)
+    {{ await_ }}invalidate_principal(*(username for username in usernames if username is not None))
+    {% endif -%}
     return db_user
 
 
-def delete_user(db: Session, user_id: int) -> bool:
-    """Delete user"""
-    db_user = get_user(db, user_id)
-    if not db_user:
-        return False
-    
-    db.delete(db_user)
-    db.commit()
-    return True
-{% endif -%}
\ No newline at end of file
+{{ async_ }}def delete_user(db: Session, user_id: int) -> bool:
+    """Delete user with a single DELETE, using RETURNING where supported to detect a miss
+
+    This is a bulk DELETE, so ORM-level relationship cascades are not applied;
+    rely on database-level ON DELETE rules for dependent rows.
+    """
+    stmt = delete(User).where(User.id == user_id)
+    {%- if cookiecutter.include_authentication == "jwt" %}
+    # The username names the cached principal to drop
+    if db.get_bind().dialect.delete_returning:
+        username = {{ await_ }}db.scalar(stmt.returning(User.username))
+    else:
+        username = {{ await_ }}db.scalar(select(User.username).where(User.id == user_id))
+        if username is not None:
+            {{ await_ }}db.execute(stmt)
+    deleted = username is not None
+    {%- else %}
+    if db.get_bind().dialect.delete_returning:
+        deleted = {{ await_ }}db.scalar(stmt.returning(User.id)) is not None
+    else:
+        result = {{ await_ }}db.execute(stmt)
+        deleted = result.rowcount > 0
+    {%- endif %}
+
+    {{ await_ }}db.commit()
+    {{ await_ }}invalidate_responses("users", user_id)
+    {% if cookiecutter.include_authentication == "jwt" -%}
+    if deleted:
+        {{ await_ }}invalidate_principal(username)
+    {% endif -%}
+    return deleted
+{% endif -%}
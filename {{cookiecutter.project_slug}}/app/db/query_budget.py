@@ -0,0 +1,133 @@
+import logging
+from collections import Counter
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Tuple
+
+from fastapi import Request
+from sqlalchemy import Engine, event
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+logger = logging.getLogger("app.sql.budget")
+
+
+class QueryBudgetExceeded(RuntimeError):
+    """Raised when a request runs more statements than its budget (QUERY_BUDGET_MODE=raise)"""
+
+
+class QueryTracker:
+    """Counts the statements run for one request, grouped by statement text
+
+    Statements reach the cursor with bound parameters still as placeholders,
+    so the same text repeated within a request is the shape a lazy load in a
+    loop (N+1) produces.
+    """
+
+    def __init__(self, route: str, budget: Optional[int] = None, raise_on_exceed: bool = False):
+        self.route = route
+        self.budget = budget
+        self.raise_on_exceed = raise_on_exceed
+        self.count = 0
+        self.statements: Counter = Counter()
+        # Sessions of the request still counting against this tracker
+        self.sessions = 0
+
+    def record(self, statement: str) -> None:
+        self.count += 1
+        self.statements[statement] += 1
+        if self.raise_on_exceed and self.over_budget:
+            raise QueryBudgetExceeded(
+                f"{self.route} ran {self.count} queries (budget {self.budget})"
+            )
+
+    @property
+    def over_budget(self) -> bool:
+        return self.budget is not None and self.count > self.budget
+
+    def repeated(self, threshold: Optional[int] = None) -> List[Tuple[str, int]]:
+        """Statements run at least `threshold` times (QUERY_REPEAT_THRESHOLD by default)"""
+        threshold = threshold or settings.query_repeat_threshold
+        return [(statement, n) for statement, n in self.statements.most_common() if n >= threshold]
+
+    def describe(self) -> str:
+        lines = [f"{self.route} ran {self.count} queries:"]
+        lines.extend(f"  {n}x {statement}" for statement, n in self.statements.most_common())
+        return "\n".join(lines)
+
+    def report(self) -> None:
+        """Log a budget overrun and statements repeated often enough to look like N+1"""
+        if self.over_budget:
+            logger.warning("%s ran %d queries (budget %d)", self.route, self.count, self.budget)
+        for statement, n in self.repeated():
+            logger.warning("%s ran the same statement %d times (possible N+1): %s", self.route, n, statement)
+
+
+def setup_query_tracking(engine: Engine) -> None:
+    """Count statements executed on `engine` against the tracker of the session using it"""
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _record_statement(conn, cursor, statement, parameters, context, executemany):
+        tracker = conn.info.get("query_tracker")
+        if tracker is not None:
+            tracker.record(statement)
+
+    @event.listens_for(engine, "checkin")
+    def _detach_tracker(dbapi_connection, connection_record):
+        connection_record.info.pop("query_tracker", None)
+
+
+@event.listens_for(Session, "after_begin")
+def _attach_tracker(session, transaction, connection):
+    """Hand the session's tracker to the pooled connection it has checked out"""
+    tracker = session.info.get("query_tracker")
+    if tracker is not None:
+        connection.info["query_tracker"] = tracker
+
+
+def track_queries(db, request: Request) -> None:
+    """Start counting statements run by session `db` while serving `request`
+
+    Every session the request opens (get_db on the primary, get_read_db on a
+    replica) shares one tracker kept on `request.state`, so the budget covers
+    them all. Budgets are looked up by endpoint function name in
+    QUERY_BUDGETS, falling back to QUERY_BUDGET.
+    """
+    if settings.query_budget_mode == "off":
+        return
+    tracker = getattr(request.state, "query_tracker", None)
+    if tracker is None:
+        endpoint = request.scope.get("endpoint")
+        route = getattr(endpoint, "__name__", request.url.path)
+        tracker = QueryTracker(
+            route,
+            budget=settings.query_budgets.get(route, settings.query_budget),
+            raise_on_exceed=settings.query_budget_mode == "raise",
+        )
+        request.state.query_tracker = tracker
+    tracker.sessions += 1
+    db.info["query_tracker"] = tracker
+
+
+def report_queries(db) -> None:
+    """Stop counting for session `db`; the request's last session logs what it ran"""
+    tracker = db.info.pop("query_tracker", None)
+    if tracker is not None:
+        tracker.sessions -= 1
+        if tracker.sessions == 0:
+            tracker.report()
+
+
+@contextmanager
+def count_queries(engine: Engine) -> Iterator[QueryTracker]:
+    """Count every statement executed on `engine` inside the block"""
+    tracker = QueryTracker("count_queries")
+
+    def _record_statement(conn, cursor, statement, parameters, context, executemany):
+        tracker.record(statement)
+
+    event.listen(engine, "after_cursor_execute", _record_statement)
+    try:
+        yield tracker
+    finally:
+        event.remove(engine, "after_cursor_execute", _record_statement)
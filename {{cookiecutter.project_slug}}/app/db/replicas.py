@@ -0,0 +1,187 @@
+{% set async_ = "async " if cookiecutter.use_async == "yes" else "" -%}
+{% set await_ = "await " if cookiecutter.use_async == "yes" else "" -%}
+import hashlib
+import itertools
+import time
+from typing import List, Optional
+
+from fastapi import Request
+from sqlalchemy import Delete, Insert, Update, event
+from sqlalchemy.orm import Session
+{% if cookiecutter.use_async == "yes" -%}
+from sqlalchemy.util import await_only
+{% endif -%}
+
+from app.core.cache import create_cache
+from app.core.config import settings
+
+# Clients that committed a write recently; their reads stay on the primary
+# until replicas have caught up. Shared between workers with CACHE_BACKEND=redis.
+_recent_writers = create_cache(
+    "read_your_writes",
+    maxsize=10_000,
+    ttl=settings.db_read_your_writes_seconds,
+    value_type=bool,
+)
+# Also set on every write, whoever made it: replica reads are not shared
+# through the response cache until it expires
+_ANY_WRITER = "*"
+
+
+def client_key(request: Request) -> str:
+    """Identify the caller for read-your-writes: its credentials if any, else its address"""
+    identity = request.headers.get("authorization") or (request.client.host if request.client else "")
+    return hashlib.sha256(identity.encode()).hexdigest()[:32]
+
+
+{{ async_ }}def wrote_recently(request: Request) -> bool:
+    """Whether the caller committed a write within DB_READ_YOUR_WRITES_SECONDS"""
+    return bool({{ await_ }}_recent_writers.get(client_key(request)))
+
+
+def reads_own_writes(db) -> bool:
+    """Whether session `db` serves a caller that just wrote; its reads bypass the response cache"""
+    return db.info.get("recent_writer", False)
+
+
+{{ async_ }}def read_is_current(db) -> bool:
+    """Whether rows read through `db` reflect every committed write, so may be cached for everyone
+
+    Primary reads always do. Replica reads that may lag do not while any
+    client's write is within DB_READ_YOUR_WRITES_SECONDS.
+    """
+    replica = db.info.get("read_replica")
+    if replica is None or not replica.may_lag:
+        return True
+    return not {{ await_ }}_recent_writers.get(_ANY_WRITER)
+
+
+class Replica:
+    """One read replica engine with its health and in-use connection count
+
+    `may_lag=False` marks an engine that sees every commit as soon as it is
+    made (a reader pool on the primary's own SQLite file).
+    """
+
+    def __init__(self, engine, may_lag: bool = True):
+        self.engine = engine
+        self.may_lag = may_lag
+        self.bind = getattr(engine, "sync_engine", engine)
+        self.in_use = 0
+        self.healthy = True
+        self.checked_at: Optional[float] = None
+
+        @event.listens_for(self.bind, "checkout")
+        def _checkout(dbapi_connection, connection_record, connection_proxy):
+            self.in_use += 1
+
+        @event.listens_for(self.bind, "checkin")
+        def _checkin(dbapi_connection, connection_record):
+            self.in_use -= 1
+
+        @event.listens_for(self.bind, "handle_error")
+        def _mark_unhealthy(context):
+            if context.is_disconnect:
+                self.record_check(False)
+
+    def record_check(self, healthy: bool) -> None:
+        self.healthy = healthy
+        self.checked_at = time.monotonic()
+
+    def check_due(self) -> bool:
+        return self.checked_at is None or time.monotonic() - self.checked_at >= settings.db_replica_check_interval_seconds
+
+    {{ async_ }}def probe(self) -> bool:
+        """Run SELECT 1 on the replica and record whether it answered"""
+        try:
+            {{ async_ }}with self.engine.connect() as conn:
+                {{ await_ }}conn.exec_driver_sql("SELECT 1")
+            healthy = True
+        except Exception:
+            healthy = False
+        self.record_check(healthy)
+        return healthy
+
+
+class ReplicaSet:
+    """Picks the replica serving a read-only session, or None for the primary"""
+
+    def __init__(self, replicas: List[Replica], strategy: str = "round_robin"):
+        self.replicas = replicas
+        self.strategy = strategy
+        # Stickiness only matters for replicas that may lag behind the primary
+        self.read_your_writes = settings.db_read_your_writes_seconds > 0 and any(
+            replica.may_lag for replica in replicas
+        )
+        self._turn = itertools.count()
+
+    def _ordered(self) -> List[Replica]:
+        if self.strategy == "least_connections":
+            return sorted(self.replicas, key=lambda replica: replica.in_use)
+        start = next(self._turn) % len(self.replicas)
+        return self.replicas[start:] + self.replicas[:start]
+
+    {{ async_ }}def choose(self) -> Optional[Replica]:
+        """Replica for the next read-only session
+
+        Returns None (use the primary) when no replicas are configured or none
+        passes its health check. Each replica is probed at most once per
+        DB_REPLICA_CHECK_INTERVAL_SECONDS; one that fails is skipped until its
+        next probe succeeds.
+        """
+        if not self.replicas:
+            return None
+        for replica in self._ordered():
+            if replica.check_due():
+                if not {{ await_ }}replica.probe():
+                    continue
+            elif not replica.healthy:
+                continue
+            return replica
+        return None
+
+
+class RoutingSession(Session):
+    """Session sending reads to `info["read_replica"]` when set, and writes to the primary
+
+    Flushes and INSERT / UPDATE / DELETE statements always use the primary,
+    so a read-only dependency that writes by mistake still writes correctly.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        replica = self.info.get("read_replica")
+        if replica is None or self._flushing or isinstance(clause, (Insert, Update, Delete)):
+            return super().get_bind(mapper, clause=clause, **kw)
+        return replica.bind
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _flag_flush(session, flush_context):
+    session.info["wrote"] = True
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _flag_write(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["wrote"] = True
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _remember_writer(session):
+    """Pin the writing client's reads to the primary for DB_READ_YOUR_WRITES_SECONDS"""
+    if session.info.pop("wrote", False) and settings.db_read_your_writes_seconds > 0:
+        key = session.info.get("client_key")
+        if key is not None:
+            {%- if cookiecutter.use_async == "yes" %}
+            # Commits of an AsyncSession run in its greenlet, which can await
+            await_only(_recent_writers.set(key, True))
+            await_only(_recent_writers.set(_ANY_WRITER, True))
+            {%- else %}
+            _recent_writers.set(key, True)
+            _recent_writers.set(_ANY_WRITER, True)
+            {%- endif %}
+
+
+@event.listens_for(RoutingSession, "after_rollback")
+def _forget_write(session):
+    session.info.pop("wrote", None)
@@ -1,6 +1,28 @@
-from sqlalchemy import create_engine, event
+from typing import List
+
+from fastapi import Request
+{% if cookiecutter.use_async == "yes" -%}
+from sqlalchemy import Engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool as QueuePool
+{% else -%}
+from sqlalchemy import Engine, create_engine, event
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import DeclarativeBase, sessionmaker
+from sqlalchemy.pool import QueuePool
+{% endif -%}
+from sqlalchemy.pool import NullPool, Pool, StaticPool
 from app.core.config import settings
+from app.db.replicas import Replica, ReplicaSet, RoutingSession, client_key, wrote_recently
+from app.db.query_budget import report_queries, setup_query_tracking, track_queries
+from app.db.slow_queries import setup_slow_query_log
+from app.db.statement_timing import setup_statement_timing
+from app.db.sql_logging import setup_sql_logging
+{% if cookiecutter.include_metrics == "yes" -%}
+from app.core.metrics import instrument_engine
+{% endif -%}
 import os
 
 # Create declarative base
@@ -13,33 +35,307 @@ if settings.database_url.startswith("sqlite"):
     dir_name = os.path.dirname(db_path) or "."
     os.makedirs(dir_name, exist_ok=True)
 
+# Pool implementations selectable through DB_POOL_CLASS
+POOL_CLASSES = {
+    "queue": QueuePool,
+    "null": NullPool,
+    "static": StaticPool,
+}
+
+
+def get_engine_options(single_writer: bool = False) -> dict:
+    """Build connection pool keyword arguments for the engine from settings
+
+    `single_writer` replaces DB_POOL_CLASS / DB_POOL_SIZE / DB_MAX_OVERFLOW with
+    one pooled connection: SQLite allows one writer at a time, so writers wait
+    their turn on the pool (up to DB_POOL_TIMEOUT) rather than on the file lock.
+    """
+    poolclass = QueuePool if single_writer else POOL_CLASSES[settings.db_pool_class]
+    options = {
+        "poolclass": poolclass,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+        "pool_recycle": settings.db_pool_recycle,
+        "query_cache_size": settings.db_query_cache_size,
+    }
+    if single_writer:
+        options.update(pool_size=1, max_overflow=0, pool_timeout=settings.db_pool_timeout)
+    elif poolclass is QueuePool:
+        options.update(
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+        )
+    return options
+
+
+def get_connect_args(url: str) -> dict:
+    """DBAPI connect arguments for `url`
+
+    asyncpg and psycopg 3 keep server-side prepared statements per connection;
+    DB_PREPARED_STATEMENT_CACHE_SIZE=0 turns them off (needed behind PgBouncer
+    in transaction pooling mode). psycopg2 has no server-side prepare.
+    """
+    drivername = make_url(url).drivername
+    if drivername in ("sqlite", "sqlite+pysqlite"):
+        return {"check_same_thread": False}
+    if drivername == "postgresql+asyncpg":
+        return {"prepared_statement_cache_size": settings.db_prepared_statement_cache_size}
+    if drivername == "postgresql+psycopg" and settings.db_prepared_statement_cache_size <= 0:
+        return {"prepare_threshold": None}
+    return {}
+
+
+def is_sqlite_file(url: str) -> bool:
+    """Whether `url` names an on-disk SQLite database (not :memory:)"""
+    parsed = make_url(url)
+    return parsed.get_backend_name() == "sqlite" and parsed.database not in (None, "", ":memory:")
+
+
+def sqlite_pragmas(read_only: bool = False) -> List[str]:
+    """PRAGMA statements run on every new SQLite connection (see SQLITE_PERFORMANCE_PROFILE)"""
+    pragmas = ["PRAGMA foreign_keys=ON"]
+    if settings.sqlite_performance_profile == "concurrent":
+        pragmas += [
+            # Readers see the last commit without blocking the writer, and vice versa
+            "PRAGMA journal_mode=WAL",
+            # fsync at checkpoints only: survives app crashes, may lose the last commits on power loss
+            "PRAGMA synchronous=NORMAL",
+            f"PRAGMA cache_size=-{settings.sqlite_cache_size_kib}",
+            f"PRAGMA mmap_size={settings.sqlite_mmap_size}",
+            f"PRAGMA busy_timeout={settings.sqlite_busy_timeout_ms}",
+            "PRAGMA temp_store=MEMORY",
+        ]
+    if read_only:
+        pragmas.append("PRAGMA query_only=ON")
+    return pragmas
+
+
+def setup_sqlite_pragmas(sync_engine: Engine, read_only: bool = False) -> None:
+    """Apply `sqlite_pragmas` to each connection `sync_engine` opens"""
+
+    @event.listens_for(sync_engine, "connect")
+    def set_sqlite_pragma(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in sqlite_pragmas(read_only):
+            cursor.execute(pragma)
+        cursor.close()
+
+
+def _pool_waiters(pool: Pool) -> int:
+    """Count callers currently blocked waiting for a pooled connection"""
+    queue = getattr(pool, "_pool", None)
+    # threading-based queue used by sync engines
+    not_empty = getattr(queue, "not_empty", None)
+    if not_empty is not None:
+        return len(getattr(not_empty, "_waiters", ()))
+    # asyncio-based queue used by async engines
+    getters = getattr(getattr(queue, "_queue", None), "_getters", ())
+    return sum(1 for getter in getters if not getter.done())
+
+
+def get_pool_status() -> dict:
+    """Snapshot of live connection pool occupancy"""
+    pool = engine.pool
+    status = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=max(pool.overflow(), 0),
+            max_overflow=pool._max_overflow,
+            waiters=_pool_waiters(pool),
+        )
+    return status
+
+
+def _listen(sync_engine: Engine) -> None:
+    """Attach statement logging, query budget, slow-query and metrics listeners
+
+    Each statement is timed once by the statement_timing listeners, and SQL
+    logging, the slow-query log and metrics all report that one duration.
+    """
+    setup_statement_timing(sync_engine)
+    setup_sql_logging(sync_engine)
+    setup_query_tracking(sync_engine)
+    setup_slow_query_log(sync_engine)
+    {%- if cookiecutter.include_metrics == "yes" %}
+    instrument_engine(sync_engine)
+    {%- endif %}
+
+
+# The concurrent SQLite profile gives the primary a single writer connection
+# and serves get_read_db from a separate query_only reader pool
+sqlite_concurrent = settings.sqlite_performance_profile == "concurrent" and is_sqlite_file(settings.database_url)
+
+
+{% if cookiecutter.use_async == "yes" -%}
+# Async drivers used when DATABASE_URL names only the backend
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+}
+
+
+def get_async_database_url(url: str) -> str:
+    """Return `url` rewritten to use an async DBAPI driver"""
+    parsed = make_url(url)
+    drivername = ASYNC_DRIVERS.get(parsed.drivername, parsed.drivername)
+    return parsed.set(drivername=drivername).render_as_string(hide_password=False)
+
+
+# Create async database engine
+engine = create_async_engine(
+    get_async_database_url(settings.database_url),
+    connect_args=get_connect_args(get_async_database_url(settings.database_url)),
+    **get_engine_options(single_writer=sqlite_concurrent),
+)
+_listen(engine.sync_engine)
+
+# For SQLite, enforce foreign keys and apply SQLITE_PERFORMANCE_PROFILE (listeners attach to the underlying sync engine)
+if settings.database_url.startswith("sqlite"):
+    setup_sqlite_pragmas(engine.sync_engine)
+
+
+def _create_replica(url: str, may_lag: bool = True) -> Replica:
+    replica_engine = create_async_engine(
+        get_async_database_url(url),
+        connect_args=get_connect_args(get_async_database_url(url)),
+        **get_engine_options(),
+    )
+    _listen(replica_engine.sync_engine)
+    if is_sqlite_file(url):
+        setup_sqlite_pragmas(replica_engine.sync_engine, read_only=True)
+    return Replica(replica_engine, may_lag=may_lag)
+
+
+# Read replicas from DATABASE_READ_URLS, used by get_read_db. Without them, the
+# concurrent SQLite profile gives reads a query_only pool on the database file:
+# under WAL those readers never wait for the writer and always see its last
+# commit, so no read-your-writes window is needed.
+if settings.database_read_urls:
+    replica_set = ReplicaSet(
+        [_create_replica(url) for url in settings.database_read_urls],
+        strategy=settings.db_replica_strategy,
+    )
+elif sqlite_concurrent:
+    replica_set = ReplicaSet([_create_replica(settings.database_url, may_lag=False)])
+else:
+    replica_set = ReplicaSet([])
+
+# Create async session factory; objects stay usable after commit without lazy IO.
+# RoutingSession sends reads to the replica chosen by get_read_db, if any.
+SessionLocal = async_sessionmaker(
+    bind=engine,
+    sync_session_class=RoutingSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+
+async def get_db(request: Request):
+    """Dependency to get async database session, counting its statements against the query budget"""
+    async with SessionLocal() as db:
+        if replica_set.read_your_writes:
+            db.info["client_key"] = client_key(request)
+        track_queries(db, request)
+        try:
+            yield db
+        finally:
+            report_queries(db)
+
+
+async def get_read_db(request: Request):
+    """Dependency for read-only endpoints: like get_db, but reads go to a healthy replica
+
+    Falls back to the primary when no replica is configured or healthy, and
+    for DB_READ_YOUR_WRITES_SECONDS after the same client committed a write.
+    """
+    recent_writer = replica_set.read_your_writes and await wrote_recently(request)
+    replica = None if recent_writer else await replica_set.choose()
+    async with SessionLocal() as db:
+        db.info["read_replica"] = replica
+        db.info["recent_writer"] = recent_writer
+        track_queries(db, request)
+        try:
+            yield db
+        finally:
+            report_queries(db)
+{% else -%}
 # Create database engine
 engine = create_engine(
     settings.database_url,
-    echo=settings.debug,
-    connect_args={"check_same_thread": False} if settings.database_url.startswith("sqlite") else {},
+    connect_args=get_connect_args(settings.database_url),
+    **get_engine_options(single_writer=sqlite_concurrent),
 )
+_listen(engine)
 
-# For SQLite, enforce foreign keys
+# For SQLite, enforce foreign keys and apply SQLITE_PERFORMANCE_PROFILE
 if settings.database_url.startswith("sqlite"):
-    @event.listens_for(engine, "connect")
-    def set_sqlite_pragma(dbapi_connection, connection_record):
-        cursor = dbapi_connection.cursor()
-        cursor.execute("PRAGMA foreign_keys=ON")
-        cursor.close()
+    setup_sqlite_pragmas(engine)
+
 
-# Create session factory
+def _create_replica(url: str, may_lag: bool = True) -> Replica:
+    replica_engine = create_engine(url, connect_args=get_connect_args(url), **get_engine_options())
+    _listen(replica_engine)
+    if is_sqlite_file(url):
+        setup_sqlite_pragmas(replica_engine, read_only=True)
+    return Replica(replica_engine, may_lag=may_lag)
+
+
+# Read replicas from DATABASE_READ_URLS, used by get_read_db. Without them, the
+# concurrent SQLite profile gives reads a query_only pool on the database file:
+# under WAL those readers never wait for the writer and always see its last
+# commit, so no read-your-writes window is needed.
+if settings.database_read_urls:
+    replica_set = ReplicaSet(
+        [_create_replica(url) for url in settings.database_read_urls],
+        strategy=settings.db_replica_strategy,
+    )
+elif sqlite_concurrent:
+    replica_set = ReplicaSet([_create_replica(settings.database_url, may_lag=False)])
+else:
+    replica_set = ReplicaSet([])
+
+# Create session factory; objects stay usable after commit without a refresh SELECT.
+# RoutingSession sends reads to the replica chosen by get_read_db, if any.
 SessionLocal = sessionmaker(
+    class_=RoutingSession,
     autocommit=False,
     autoflush=False,
+    expire_on_commit=False,
     bind=engine,
 )
 
 
-def get_db():
-    """Dependency to get database session"""
+def get_db(request: Request):
+    """Dependency to get database session, counting its statements against the query budget"""
+    db = SessionLocal()
+    if replica_set.read_your_writes:
+        db.info["client_key"] = client_key(request)
+    track_queries(db, request)
+    try:
+        yield db
+    finally:
+        db.close()
+        report_queries(db)
+
+
+def get_read_db(request: Request):
+    """Dependency for read-only endpoints: like get_db, but reads go to a healthy replica
+
+    Falls back to the primary when no replica is configured or healthy, and
+    for DB_READ_YOUR_WRITES_SECONDS after the same client committed a write.
+    """
+    recent_writer = replica_set.read_your_writes and wrote_recently(request)
     db = SessionLocal()
+    db.info["read_replica"] = None if recent_writer else replica_set.choose()
+    db.info["recent_writer"] = recent_writer
+    track_queries(db, request)
     try:
         yield db
     finally:
         db.close()
+        report_queries(db)
+{% endif -%}
@@ -0,0 +1,124 @@
+import re
+import threading
+from collections import Counter, deque
+from datetime import datetime, timezone
+from typing import Any, Deque, List, Optional
+
+from sqlalchemy import Connection, Engine, event
+
+from app.core.config import settings
+from app.db.statement_timing import setup_statement_timing, statement_duration_ms
+
+# Statement kinds EXPLAIN accepts without executing them
+_EXPLAINABLE = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE")
+_PLACEHOLDER = r"(?:\?|%s|%\(\w+\)s|\$\d+|:\w+)"
+# "(?, ?, ?)" or "($1, $2)" -> "(...)", so IN lists of any length normalize alike
+_PLACEHOLDER_LIST = re.compile(rf"\(\s*{_PLACEHOLDER}(?:\s*,\s*{_PLACEHOLDER})+\s*\)")
+_REPEATED_ROWS = re.compile(r"\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))+")
+
+
+def normalize_statement(statement: str) -> str:
+    """Collapse whitespace and placeholder lists so equivalent statements read the same"""
+    statement = " ".join(statement.split())
+    statement = _PLACEHOLDER_LIST.sub("(...)", statement)
+    return _REPEATED_ROWS.sub("(...), ...", statement)
+
+
+def _value_types(values) -> str:
+    counts = Counter(type(value).__name__ for value in values)
+    return ", ".join(name if n == 1 else f"{n} x {name}" for name, n in counts.items())
+
+
+def parameter_shape(parameters: Any, executemany: bool = False) -> str:
+    """Types of the bound parameters, never their values"""
+    if executemany:
+        rows = list(parameters)
+        return f"{len(rows)} rows of {parameter_shape(rows[0]) if rows else '()'}"
+    if isinstance(parameters, dict):
+        if len(parameters) > 10:
+            return "{" + _value_types(parameters.values()) + "}"
+        return "{" + ", ".join(f"{key}: {type(value).__name__}" for key, value in parameters.items()) + "}"
+    if isinstance(parameters, (list, tuple)):
+        return "(" + _value_types(parameters) + ")"
+    return type(parameters).__name__
+
+
+class SlowQuery:
+    """One statement that ran longer than SLOW_QUERY_THRESHOLD_MS"""
+
+    def __init__(self, statement: str, parameters: Any, executemany: bool, duration_ms: float, route: Optional[str]):
+        self.recorded_at = datetime.now(timezone.utc)
+        self.duration_ms = duration_ms
+        self.route = route
+        self.statement = normalize_statement(statement)
+        self.parameter_shape = parameter_shape(parameters, executemany)
+        self.plan: Optional[str] = None
+        # Raw statement and values are kept, in memory only, to run EXPLAIN later
+        self._explain_args = None
+        if settings.slow_query_explain and statement.lstrip().upper().startswith(_EXPLAINABLE):
+            self._explain_args = (statement, list(parameters)[0] if executemany else parameters)
+
+    def as_dict(self) -> dict:
+        return {
+            "recorded_at": self.recorded_at.isoformat(),
+            "duration_ms": round(self.duration_ms, 3),
+            "route": self.route,
+            "statement": self.statement,
+            "parameters": self.parameter_shape,
+            "plan": self.plan,
+        }
+
+
+_slow_queries: Deque[SlowQuery] = deque(maxlen=max(settings.slow_query_log_size, 1))
+_lock = threading.Lock()
+
+
+def setup_slow_query_log(engine: Engine) -> None:
+    """Record statements on `engine` slower than SLOW_QUERY_THRESHOLD_MS in a ring buffer"""
+    if settings.slow_query_log_size <= 0:
+        return
+    setup_statement_timing(engine)
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _record_slow_query(conn, cursor, statement, parameters, context, executemany):
+        duration_ms = statement_duration_ms(conn)
+        if duration_ms < settings.slow_query_threshold_ms or statement.startswith("EXPLAIN"):
+            return
+        # The calling route comes from the request's query tracker (QUERY_BUDGET_MODE != off)
+        route = getattr(conn.info.get("query_tracker"), "route", None)
+        entry = SlowQuery(statement, parameters, executemany, duration_ms, route)
+        with _lock:
+            _slow_queries.append(entry)
+
+
+def explain_slow_queries(conn: Connection) -> None:
+    """Capture plans for recorded statements that lack one, on the separate connection `conn`
+
+    Runs EXPLAIN QUERY PLAN on SQLite and plain EXPLAIN elsewhere; neither
+    executes the statement.
+    """
+    prefix = "EXPLAIN QUERY PLAN" if conn.dialect.name == "sqlite" else "EXPLAIN"
+    with _lock:
+        pending = [entry for entry in _slow_queries if entry._explain_args and entry.plan is None]
+    for entry in pending:
+        statement, parameters = entry._explain_args
+        try:
+            rows = conn.exec_driver_sql(f"{prefix} {statement}", parameters).all()
+            entry.plan = "\n".join(str(row[-1]) for row in rows)
+        except Exception as exc:
+            conn.rollback()
+            entry.plan = f"EXPLAIN failed: {exc}"
+        entry._explain_args = None
+    conn.rollback()
+
+
+def get_slow_queries() -> List[dict]:
+    """Recorded slow statements, newest first"""
+    with _lock:
+        entries = list(_slow_queries)
+    return [entry.as_dict() for entry in reversed(entries)]
+
+
+def clear_slow_queries() -> None:
+    with _lock:
+        _slow_queries.clear()
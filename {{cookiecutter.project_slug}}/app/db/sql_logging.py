@@ -0,0 +1,35 @@
+import itertools
+import logging
+
+from sqlalchemy import Engine, event
+from app.core.config import settings
+from app.db.statement_timing import setup_statement_timing, statement_duration_ms
+
+logger = logging.getLogger("app.sql")
+
+
+def setup_sql_logging(engine: Engine) -> None:
+    """Attach statement logging to `engine` according to SQL_LOG_MODE"""
+    mode = settings.sql_log_mode
+    if mode == "off":
+        return
+
+    if not logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(asctime)s %(name)s %(message)s"))
+        logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+
+    sample_rate = max(settings.sql_log_sample_rate, 1)
+    slow_threshold_ms = settings.sql_log_slow_threshold_ms
+    statement_counter = itertools.count()
+    setup_statement_timing(engine)
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _log_statement(conn, cursor, statement, parameters, context, executemany):
+        elapsed_ms = statement_duration_ms(conn)
+        if mode == "sampled" and next(statement_counter) % sample_rate:
+            return
+        if mode == "slow" and elapsed_ms < slow_threshold_ms:
+            return
+        logger.info("[%.1f ms] %s %r", elapsed_ms, statement, parameters)
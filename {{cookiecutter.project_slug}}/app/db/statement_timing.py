@@ -0,0 +1,29 @@
+import time
+
+from sqlalchemy import Engine, event
+
+
+def _start_timer(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _stop_timer(conn, cursor, statement, parameters, context, executemany):
+    conn.info["query_duration_ms"] = (time.perf_counter() - conn.info["query_start_time"].pop()) * 1000
+
+
+def setup_statement_timing(engine: Engine) -> None:
+    """Time each statement executed on `engine` once, for every listener reporting durations
+
+    The stop listener runs ahead of all other after_cursor_execute listeners,
+    which read the result through `statement_duration_ms`. Calling this again
+    for the same engine does nothing.
+    """
+    if event.contains(engine, "before_cursor_execute", _start_timer):
+        return
+    event.listen(engine, "before_cursor_execute", _start_timer)
+    event.listen(engine, "after_cursor_execute", _stop_timer, insert=True)
+
+
+def statement_duration_ms(conn) -> float:
+    """How long the statement that just ran on `conn` took, from an after_cursor_execute listener"""
+    return conn.info["query_duration_ms"]
@@ -1,3 +1,5 @@
+{% set async_ = "async " if cookiecutter.use_async == "yes" else "" -%}
+{% set await_ = "await " if cookiecutter.use_async == "yes" else "" -%}
 from fastapi import FastAPI{% if cookiecutter.include_rate_limiting == "yes" %}, Request{% endif %}
 {% if cookiecutter.include_cors == "yes" -%}
 from fastapi.middleware.cors import CORSMiddleware
@@ -8,6 +10,17 @@ from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 {% endif -%}
 from app.core.config import settings
+{% if cookiecutter.json_response != "stdlib" -%}
+from app.core.responses import FastJSONResponse
+{% endif -%}
+{% if cookiecutter.include_metrics == "yes" -%}
+from app.core.metrics import setup_metrics
+from app.db.session import get_pool_status
+{% endif -%}
+{% if cookiecutter.include_user_model == "yes" -%}
+from app.crud import user as user_crud
+from app.db.session import SessionLocal, replica_set
+{% endif -%}
 from app.api.v1.api import api_router
 from app.admin import setup_admin
 
@@ -22,6 +35,9 @@ app = FastAPI(
     description=settings.description,
     version=settings.version,
     debug=settings.debug,
+    {%- if cookiecutter.json_response != "stdlib" %}
+    default_response_class=FastJSONResponse,
+    {%- endif %}
 )
 
 # Defer SQLAdmin setup to startup to ensure all models are imported
@@ -29,6 +45,24 @@ app = FastAPI(
 def _init_admin():
     # setup_admin handles safe model import without shadowing
     setup_admin(app)
+{% if cookiecutter.include_user_model == "yes" %}
+
+@app.on_event("startup")
+{{ async_ }}def _warm_statement_cache():
+    # Compile the prebuilt CRUD statements before the first request
+    if settings.db_warm_statement_cache:
+        {{ async_ }}with SessionLocal() as db:
+            {{ await_ }}user_crud.warm_statement_cache(db)
+        # Each replica engine (or SQLite reader pool) has its own compiled cache
+        for replica in replica_set.replicas:
+            try:
+                {{ async_ }}with SessionLocal() as db:
+                    db.info["read_replica"] = replica
+                    {{ await_ }}user_crud.warm_statement_cache(db)
+            except Exception:
+                # Unreachable: get_read_db skips it until a health probe succeeds
+                replica.record_check(False)
+{% endif %}
 
 {% if cookiecutter.include_rate_limiting == "yes" -%}
 # Add rate limiting
@@ -44,9 +78,15 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    {%- if cookiecutter.include_user_model == "yes" %}
+    expose_headers=["X-Next-Cursor", "X-Total-Count", "ETag"],
+    {%- endif %}
 )
 {% endif -%}
-
+{% if cookiecutter.include_metrics == "yes" %}
+# Request, database and pool metrics at /metrics (outermost middleware)
+setup_metrics(app, get_pool_status)
+{% endif %}
 # Include API router
 app.include_router(api_router, prefix=settings.api_v1_str)
 
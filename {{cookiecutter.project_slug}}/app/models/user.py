@@ -2,9 +2,9 @@
 from datetime import datetime
 from typing import Optional
 {% if cookiecutter.include_authentication == "jwt" -%}
-from sqlalchemy import String, DateTime, func, Boolean
+from sqlalchemy import String, DateTime, Index, func, Boolean, Integer, literal_column
 {% else -%}
-from sqlalchemy import String, DateTime, func
+from sqlalchemy import String, DateTime, Index, func, Integer, literal_column
 {% endif -%}
 from sqlalchemy.orm import Mapped, mapped_column
 from app.db.session import Base
@@ -13,6 +13,12 @@ from app.db.session import Base
 class User(Base):
     """User model{% if cookiecutter.include_authentication != "none" %} with authentication support{% endif %}"""
     __tablename__ = "users"
+    __table_args__ = (
+        # Serve the filters and sort keys of crud.user.get_users (see SORT_KEYS)
+        Index("ix_users_is_active_created_at_id", "is_active", "created_at", "id"),
+        Index("ix_users_created_at_id", "created_at", "id"),
+        Index("ix_users_name_id", "name", "id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     {% if cookiecutter.include_authentication == "jwt" -%}
@@ -29,6 +35,11 @@ class User(Base):
     {% endif -%}
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
     updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), onupdate=func.now())
+    # Incremented by every UPDATE, bulk ones included; goes into ETags, since
+    # updated_at has one-second resolution on SQLite
+    version: Mapped[int] = mapped_column(
+        default=1, server_default="1", onupdate=literal_column("version", Integer) + 1
+    )
 
     def __repr__(self):
         return f"User(id={self.id}, name={self.name}, email={self.email})"
@@ -1,7 +1,8 @@
 {% if cookiecutter.include_user_model == "yes" -%}
 from datetime import datetime
-from typing import Optional
-from pydantic import BaseModel, EmailStr
+from functools import lru_cache
+from typing import List, Optional, Tuple, Type
+from pydantic import BaseModel, EmailStr, TypeAdapter, create_model
 
 
 class UserBase(BaseModel):
@@ -22,6 +23,33 @@ class UserCreate(UserBase):
     pass
 
 
+class UserFilter(BaseModel):
+    """Filters for listing users; prefixes match case-sensitively"""
+    is_active: Optional[bool] = None
+    created_after: Optional[datetime] = None
+    created_before: Optional[datetime] = None
+    email_prefix: Optional[str] = None
+    name_prefix: Optional[str] = None
+
+
+class UserBulkCreate(BaseModel):
+    """Schema for creating many users in one request"""
+    users: List[UserCreate]
+
+
+class UserBulkError(BaseModel):
+    """Why one row of a bulk create was rejected"""
+    index: int
+    field: str
+    detail: str
+
+
+class UserBulkCreateResponse(BaseModel):
+    """Bulk create outcome: IDs of created rows (in request order) and rejected rows"""
+    created: List[int]
+    errors: List[UserBulkError]
+
+
 {% if cookiecutter.include_authentication == "jwt" -%}
 class UserLogin(BaseModel):
     """Schema for user login"""
@@ -49,11 +77,22 @@ class UserResponse(UserBase):
     {% endif -%}
     created_at: datetime
     updated_at: Optional[datetime] = None
+    version: int
 
     class Config:
         from_attributes = True
 
 
+@lru_cache(maxsize=128)
+def user_projection(fields: Tuple[str, ...]) -> Tuple[Type[BaseModel], TypeAdapter]:
+    """Slim response model with only `fields` of UserResponse, plus a list adapter for it"""
+    model = create_model(
+        f"UserResponse[{','.join(fields)}]",
+        **{field: (UserResponse.model_fields[field].annotation, ...) for field in fields},
+    )
+    return model, TypeAdapter(List[model])
+
+
 {% if cookiecutter.include_authentication == "jwt" -%}
 class Token(BaseModel):
     """Token response schema"""
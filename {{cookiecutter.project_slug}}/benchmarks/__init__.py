@@ -0,0 +1,3 @@
+{% if cookiecutter.include_user_model == "yes" -%}
+"""Benchmark scripts for {{cookiecutter.project_name}}"""
+{% endif -%}
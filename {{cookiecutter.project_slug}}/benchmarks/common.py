@@ -0,0 +1,133 @@
+{% if cookiecutter.include_user_model == "yes" -%}
+{% set async_ = "async " if cookiecutter.use_async == "yes" else "" -%}
+{% set await_ = "await " if cookiecutter.use_async == "yes" else "" -%}
+"""
+Shared helpers for the benchmark scripts
+
+Benchmarks run against a throwaway SQLite file seeded with users, so results
+neither depend on nor disturb the database configured in DATABASE_URL.
+"""
+import os
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import {% if cookiecutter.use_async == "yes" %}asynccontextmanager, {% endif %}contextmanager
+from typing import Callable, Iterator, List, Tuple
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, insert
+{% if cookiecutter.use_async == "yes" -%}
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+{% else -%}
+from sqlalchemy.orm import Session, sessionmaker
+{% endif -%}
+from app.db.session import Base
+from app.models import User
+
+SEED_BATCH_SIZE = 10_000
+
+
+def user_row(i: int) -> dict:
+    """Column values for the i-th seeded user"""
+    return {
+        "name": f"User {i}",
+        "email": f"user{i}@example.com",
+        {% if cookiecutter.include_authentication == "jwt" -%}
+        "username": f"user{i}",
+        "hashed_password": "not-a-real-hash",
+        {% endif -%}
+        "is_active": True,
+    }
+
+
+@contextmanager
+def seeded_database(rows: int) -> Iterator[str]:
+    """Yield the path of a temporary SQLite database seeded with `rows` users"""
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        for start in range(0, rows, SEED_BATCH_SIZE):
+            stop = min(start + SEED_BATCH_SIZE, rows)
+            conn.execute(insert(User), [user_row(i) for i in range(start, stop)])
+    engine.dispose()
+    try:
+        yield path
+    finally:
+        os.remove(path)
+
+
+{% if cookiecutter.use_async == "yes" -%}
+@asynccontextmanager
+async def open_session(path: str, **engine_options):
+    """Async session bound to the benchmark database"""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}", **engine_options)
+    try:
+        async with AsyncSession(engine, expire_on_commit=False) as db:
+            yield db
+    finally:
+        await engine.dispose()
+
+
+def database_override(path: str) -> Callable:
+    """`get_db` replacement bound to the benchmark database"""
+    factory = async_sessionmaker(create_async_engine(f"sqlite+aiosqlite:///{path}"), expire_on_commit=False)
+
+    async def override_get_db():
+        async with factory() as db:
+            yield db
+
+    return override_get_db
+{% else -%}
+@contextmanager
+def open_session(path: str, **engine_options) -> Iterator[Session]:
+    """Session bound to the benchmark database"""
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False}, **engine_options)
+    try:
+        with Session(engine) as db:
+            yield db
+    finally:
+        engine.dispose()
+
+
+def database_override(path: str) -> Callable:
+    """`get_db` replacement bound to the benchmark database"""
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    factory = sessionmaker(bind=engine, expire_on_commit=False)
+
+    def override_get_db():
+        with factory() as db:
+            yield db
+
+    return override_get_db
+{% endif %}
+
+{{ async_ }}def measure(fn: Callable, repeat: int = 20) -> float:
+    """Median wall time of `fn()` in milliseconds"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        {{ await_ }}fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of `values`"""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def report(title: str, header: Tuple[str, ...], rows: List[Tuple]) -> None:
+    """Print benchmark results as an aligned table"""
+    table = [header] + [tuple(f"{v:.3f}" if isinstance(v, float) else str(v) for v in row) for row in rows]
+    widths = [max(len(row[i]) for row in table) for i in range(len(header))]
+    print(f"\n{title}")
+    print("=" * len(title))
+    for row in table:
+        print("  ".join(value.rjust(width) for value, width in zip(row, widths)))
+{% endif -%}
@@ -0,0 +1,91 @@
+{% if cookiecutter.include_user_model == "yes" -%}
+{% set async_ = "async " if cookiecutter.use_async == "yes" else "" -%}
+{% set await_ = "await " if cookiecutter.use_async == "yes" else "" -%}
+"""
+Peak memory of streaming export vs the paginated list endpoint
+
+Seeds SQLite databases of increasing size and reports the peak Python heap
+(tracemalloc) and wall time for serializing every user through
+`GET /users/export` and, up to --list-max-rows, through a single
+`GET /users/?limit=N` page.
+
+Usage:
+    python -m benchmarks.export [--rows 1000000] [--format ndjson] [--list-max-rows 100000]
+"""
+import argparse
+import asyncio
+import json
+import time
+import tracemalloc
+from typing import List
+
+from fastapi.encoders import jsonable_encoder
+
+from benchmarks.common import open_session, report, seeded_database
+from app.api.v1.endpoints import users as users_endpoint
+from app.crud import user as user_crud
+from app.schemas.user import UserResponse
+
+
+async def export_all(db, export_format: str) -> int:
+    """Drain the export response body, returning the number of bytes sent"""
+    response = {{ await_ }}users_endpoint.export_users(
+        export_format=export_format,
+        db=db,
+        {% if cookiecutter.include_authentication == "jwt" -%}
+        current_user=None,
+        {% endif -%}
+    )
+    sent = 0
+    async for chunk in response.body_iterator:
+        sent += len(chunk)
+    return sent
+
+
+async def list_all(db, rows: int) -> int:
+    """Serialize all users as one list page the way the list endpoint does"""
+    users = {{ await_ }}user_crud.get_users(db, limit=rows)
+    body = json.dumps(jsonable_encoder([UserResponse.model_validate(user) for user in users]))
+    return len(body)
+
+
+async def profile(fn) -> tuple:
+    """Peak traced heap (MB) and wall time (s) of awaiting `fn()`"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    await fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 2**20, elapsed
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--format", choices=["ndjson", "csv"], default="ndjson")
+    parser.add_argument("--list-max-rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    results: List[tuple] = []
+    for rows in (args.rows // 100, args.rows // 10, args.rows):
+        print(f"Seeding {rows:,} users...")
+        with seeded_database(rows) as path:
+            {{ async_ }}with open_session(path) as db:
+                export_mb, export_s = await profile(lambda: export_all(db, args.format))
+                if rows <= args.list_max_rows:
+                    list_mb, list_s = await profile(lambda: list_all(db, rows))
+                else:
+                    list_mb = list_s = "-"
+        results.append((f"{rows:,}", export_mb, export_s, list_mb, list_s))
+
+    report(
+        f"Serializing all users: {args.format} export vs one list page (peak MB, seconds)",
+        ("rows", "export MB", "export s", "list MB", "list s"),
+        results,
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
+{% endif -%}
@@ -0,0 +1,70 @@
+{% if cookiecutter.include_user_model == "yes" and cookiecutter.json_response != "stdlib" -%}
+"""
+Throughput of GET /api/v1/users/?limit=100 with stdlib JSON vs {{ cookiecutter.json_response }}
+
+Builds the API twice against the same seeded SQLite database, once with
+FastAPI's default `JSONResponse` and once with `FastJSONResponse`, and reports
+requests per second plus the cost of rendering the page body alone.
+
+Usage:
+    python -m benchmarks.json_response [--requests 2000] [--limit 100]
+"""
+import argparse
+import time
+import timeit
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+
+from benchmarks.common import database_override, report, seeded_database
+from app.api.v1.api import api_router
+{% if cookiecutter.include_authentication == "jwt" -%}
+from app.api.v1.endpoints import users as users_endpoint
+{% endif -%}
+from app.core.config import settings
+from app.core.responses import FastJSONResponse
+from app.db.session import get_db, get_read_db
+
+
+def build_app(response_class: type, path: str) -> FastAPI:
+    """API router mounted on a fresh app rendering with `response_class`"""
+    app = FastAPI(default_response_class=response_class)
+    app.include_router(api_router, prefix=settings.api_v1_str)
+    app.dependency_overrides[get_db] = app.dependency_overrides[get_read_db] = database_override(path)
+    {% if cookiecutter.include_authentication == "jwt" -%}
+    app.dependency_overrides[users_endpoint.get_current_active_user] = lambda: None
+    {% endif -%}
+    return app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--limit", type=int, default=100)
+    args = parser.parse_args()
+
+    url = f"{settings.api_v1_str}/users/?limit={args.limit}"
+    results = []
+    with seeded_database(args.limit) as path:
+        for response_class in (JSONResponse, FastJSONResponse):
+            with TestClient(build_app(response_class, path)) as client:
+                payload = client.get(url).json()
+                assert len(payload) == args.limit
+                start = time.perf_counter()
+                for _ in range(args.requests):
+                    client.get(url)
+                elapsed = time.perf_counter() - start
+            render_us = timeit.timeit(lambda: response_class(payload), number=1000) * 1000
+            results.append((response_class.__name__, args.requests / elapsed, render_us))
+
+    report(
+        f"GET {url}: throughput (req/s) and body render cost (us)",
+        ("response class", "req/s", "render us"),
+        results,
+    )
+
+
+if __name__ == "__main__":
+    main()
+{% endif -%}
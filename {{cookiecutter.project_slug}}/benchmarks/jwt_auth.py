@@ -0,0 +1,47 @@
+{% if cookiecutter.include_authentication == "jwt" -%}
+"""
+JWT verification overhead per request
+
+Reports the per-call cost of verifying a bearer token with each JWT backend,
+uncached and through the verified-claims cache used by `get_current_user`.
+
+Usage:
+    python -m benchmarks.jwt_auth [--number 20000]
+"""
+import argparse
+import os
+import sys
+import timeit
+from datetime import datetime, timedelta
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import report
+from app.core import security
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--number", type=int, default=20_000)
+    args = parser.parse_args()
+
+    claims = {"sub": "benchmark-user", "exp": datetime.utcnow() + timedelta(hours=1)}
+    token = security.encode_access_token(claims)
+
+    results = []
+    for name in sorted(security.JWT_BACKENDS):
+        _, decode = security.get_jwt_backend(name)
+        seconds = timeit.timeit(lambda: decode(token), number=args.number)
+        results.append((f"{name} (uncached)", seconds / args.number * 1e6))
+
+    security.decode_access_token(token)
+    seconds = timeit.timeit(lambda: security.decode_access_token(token), number=args.number)
+    results.append((f"{security.settings.jwt_backend} (claims cache)", seconds / args.number * 1e6))
+
+    report("JWT verification cost per request (us)", ("path", "us/call"), results)
+
+
+if __name__ == "__main__":
+    main()
+{% endif -%}
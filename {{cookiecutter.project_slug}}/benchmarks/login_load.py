@@ -0,0 +1,100 @@
+{% if cookiecutter.include_user_model == "yes" and cookiecutter.include_authentication == "jwt" -%}
+"""
+/health latency while logins are in flight
+
+Probes GET /health on an idle app, then again while concurrent
+POST /api/v1/users/token requests run bcrypt verification, and reports the
+/health p50/p99 latency for both. Hashing runs on the bounded password
+pool, so logins should barely move the /health tail.
+
+Usage:
+    python -m benchmarks.login_load [--logins 40] [--concurrency 8]
+"""
+import argparse
+import asyncio
+import time
+from typing import Optional
+
+import httpx
+from sqlalchemy import create_engine, update
+
+from benchmarks.common import database_override, percentile, report, seeded_database
+from app.core.security import get_hash_pool_stats, get_password_hash
+from app.db.session import get_db
+from app.main import app
+from app.models import User
+
+PASSWORD = "benchmark-password"
+
+
+async def probe_health(client: httpx.AsyncClient, stop: asyncio.Event) -> list:
+    """Request /health back to back until `stop` is set, returning latencies in ms"""
+    latencies = []
+    while not stop.is_set():
+        start = time.perf_counter()
+        await client.get("/health")
+        latencies.append((time.perf_counter() - start) * 1000)
+        await asyncio.sleep(0.005)
+    return latencies
+
+
+async def run_logins(client: httpx.AsyncClient, total: int, concurrency: int) -> None:
+    """Log in `total` times with at most `concurrency` requests in flight"""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def login():
+        async with semaphore:
+            response = await client.post(
+                "/api/v1/users/token", data={"username": "user0", "password": PASSWORD}
+            )
+            response.raise_for_status()
+
+    await asyncio.gather(*(login() for _ in range(total)))
+
+
+async def measure_health(client: httpx.AsyncClient, load: Optional[asyncio.Future] = None) -> list:
+    """Probe /health for one second, or for as long as `load` runs"""
+    stop = asyncio.Event()
+    probe = asyncio.create_task(probe_health(client, stop))
+    if load is None:
+        await asyncio.sleep(1.0)
+    else:
+        await load
+    stop.set()
+    return await probe
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--logins", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    with seeded_database(1) as path:
+        engine = create_engine(f"sqlite:///{path}")
+        with engine.begin() as conn:
+            conn.execute(update(User).values(hashed_password=get_password_hash(PASSWORD)))
+        engine.dispose()
+
+        app.dependency_overrides[get_db] = database_override(path)
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+            idle = await measure_health(client)
+            loaded = await measure_health(
+                client, run_logins(client, args.logins, args.concurrency)
+            )
+
+    report(
+        f"/health latency with {args.logins} logins at concurrency {args.concurrency} (ms)",
+        ("scenario", "requests", "p50", "p99"),
+        [
+            ("idle", len(idle), percentile(idle, 50), percentile(idle, 99)),
+            ("during logins", len(loaded), percentile(loaded, 50), percentile(loaded, 99)),
+        ],
+    )
+    print(f"\nPassword hashing pool: {get_hash_pool_stats()}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
+{% endif -%}
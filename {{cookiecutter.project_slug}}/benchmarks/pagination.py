@@ -0,0 +1,59 @@
+{% if cookiecutter.include_user_model == "yes" -%}
+{% set async_ = "async " if cookiecutter.use_async == "yes" else "" -%}
+{% set await_ = "await " if cookiecutter.use_async == "yes" else "" -%}
+"""
+Offset vs keyset pagination benchmark for `crud.user.get_users`
+
+Seeds a SQLite database with enough users to reach the deep page and reports
+the median latency of page 1 and the deep page in both pagination modes.
+
+Usage:
+    python -m benchmarks.pagination [--page-size 100] [--deep-page 10000]
+"""
+import argparse
+{% if cookiecutter.use_async == "yes" -%}
+import asyncio
+{% endif -%}
+
+from benchmarks.common import measure, open_session, report, seeded_database
+from app.crud import user as user_crud
+
+
+{{ async_ }}def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--deep-page", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    rows = args.page_size * args.deep_page
+    print(f"Seeding {rows:,} users...")
+    with seeded_database(rows) as path:
+        {{ async_ }}with open_session(path) as db:
+            results = []
+            for page in (1, args.deep_page):
+                skip = (page - 1) * args.page_size
+                # Seeded IDs are 1..N, so the cursor for page N is the last ID of page N-1
+                after_id = skip or None
+                offset_ms = {{ await_ }}measure(
+                    lambda: user_crud.get_users(db, skip=skip, limit=args.page_size), args.repeat
+                )
+                keyset_ms = {{ await_ }}measure(
+                    lambda: user_crud.get_users(db, limit=args.page_size, after_id=after_id), args.repeat
+                )
+                results.append((page, offset_ms, keyset_ms))
+
+    report(
+        f"get_users latency, {rows:,} rows, page size {args.page_size} (median ms)",
+        ("page", "offset", "keyset"),
+        results,
+    )
+
+
+if __name__ == "__main__":
+    {% if cookiecutter.use_async == "yes" -%}
+    asyncio.run(main())
+    {% else -%}
+    main()
+    {% endif -%}
+{% endif -%}
@@ -0,0 +1,76 @@
+{% if cookiecutter.include_user_model == "yes" -%}
+{% set async_ = "async " if cookiecutter.use_async == "yes" else "" -%}
+{% set await_ = "await " if cookiecutter.use_async == "yes" else "" -%}
+"""
+Per-row cost of listing users: ORM hydration vs the Core-row fast path
+
+For each page size, reports the median cost per row of fetching a page and
+rendering it to JSON the way each path does:
+  orm    - ORM entities, validated into UserResponse (from_attributes), dumped
+  core   - Core rows of the response columns, validated from mappings, dumped
+  fast   - Core rows wrapped with model_construct, dumped (GET /users/ path)
+
+Usage:
+    python -m benchmarks.row_hydration [--sizes 1000 10000] [--repeat 10]
+"""
+import argparse
+{% if cookiecutter.use_async == "yes" -%}
+import asyncio
+{% endif -%}
+from typing import List
+
+from pydantic import TypeAdapter
+
+from benchmarks.common import measure, open_session, report, seeded_database
+from app.crud import user as user_crud
+from app.schemas.user import UserResponse, user_projection
+
+user_list = TypeAdapter(List[UserResponse])
+
+
+{{ async_ }}def orm_path(db, limit: int) -> bytes:
+    users = {{ await_ }}user_crud.get_users(db, limit=limit)
+    return user_list.dump_json(user_list.validate_python(users, from_attributes=True))
+
+
+{{ async_ }}def core_path(db, limit: int) -> bytes:
+    rows = {{ await_ }}user_crud.get_users(db, limit=limit, fields=user_crud.EXPORT_FIELDS)
+    return user_list.dump_json(user_list.validate_python([row._mapping for row in rows]))
+
+
+{{ async_ }}def fast_path(db, limit: int) -> bytes:
+    rows = {{ await_ }}user_crud.get_users(db, limit=limit, fields=user_crud.EXPORT_FIELDS)
+    model, list_adapter = user_projection(user_crud.EXPORT_FIELDS)
+    return list_adapter.dump_json([model.model_construct(**row._mapping) for row in rows])
+
+
+{{ async_ }}def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000])
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    results = []
+    with seeded_database(max(args.sizes)) as path:
+        {{ async_ }}with open_session(path) as db:
+            for size in args.sizes:
+                row = [size]
+                for path_fn in (orm_path, core_path, fast_path):
+                    elapsed_ms = {{ await_ }}measure(lambda: path_fn(db, size), args.repeat)
+                    row.append(elapsed_ms * 1000 / size)
+                results.append(tuple(row))
+
+    report(
+        "Listing users: median cost per row (us)",
+        ("rows", "orm", "core", "fast"),
+        results,
+    )
+
+
+if __name__ == "__main__":
+    {% if cookiecutter.use_async == "yes" -%}
+    asyncio.run(main())
+    {% else -%}
+    main()
+    {% endif -%}
+{% endif -%}
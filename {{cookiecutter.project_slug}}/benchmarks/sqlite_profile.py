@@ -0,0 +1,117 @@
+{% if cookiecutter.include_user_model == "yes" -%}
+"""
+Reads while a writer commits, with and without the concurrent SQLite profile
+
+One writer thread commits single-row inserts back to back while `--readers`
+threads each fetch pages of 20 users, for `--seconds` per profile:
+  off        - rollback journal, foreign_keys only (the default)
+  concurrent - SQLITE_PERFORMANCE_PROFILE=concurrent: WAL and the tuning
+               PRAGMAs, writes on one primary connection, reads on a query_only pool
+Each profile gets a freshly seeded database, since WAL mode persists in the
+file. Threads and the sync driver are used under both templates: what is
+measured is SQLite's locking, which aiosqlite shares.
+
+Usage:
+    python -m benchmarks.sqlite_profile [--rows 100000] [--readers 8] [--seconds 5]
+"""
+import argparse
+import random
+import threading
+import time
+from typing import List
+
+from sqlalchemy import bindparam, create_engine, insert, select
+from sqlalchemy.exc import OperationalError
+
+from benchmarks.common import percentile, report, seeded_database, user_row
+from app.core.config import settings
+from app.db.session import setup_sqlite_pragmas
+from app.models import User
+
+PAGE = select(User.id, User.name, User.email).where(User.id >= bindparam("start")).order_by(User.id).limit(20)
+
+
+def run_profile(path: str, rows: int, readers: int, seconds: float) -> tuple:
+    """Writer and reader threads against `path`; returns one results row"""
+    connect_args = {"check_same_thread": False}
+    writer = create_engine(f"sqlite:///{path}", connect_args=connect_args, pool_size=1, max_overflow=0)
+    reader = create_engine(f"sqlite:///{path}", connect_args=connect_args, pool_size=readers)
+    setup_sqlite_pragmas(writer)
+    setup_sqlite_pragmas(reader, read_only=settings.sqlite_performance_profile == "concurrent")
+
+    stop = threading.Event()
+    timings: List[List[float]] = [[] for _ in range(readers)]
+    writes = [0]
+    errors = [0]
+
+    def write() -> None:
+        i = rows
+        while not stop.is_set():
+            try:
+                with writer.begin() as conn:
+                    conn.execute(insert(User), user_row(i))
+                i += 1
+                writes[0] += 1
+            except OperationalError:
+                errors[0] += 1
+
+    def read(samples: List[float]) -> None:
+        while not stop.is_set():
+            start = time.perf_counter()
+            try:
+                with reader.connect() as conn:
+                    conn.execute(PAGE, {"start": random.randint(1, rows)}).all()
+            except OperationalError:
+                errors[0] += 1
+                continue
+            samples.append((time.perf_counter() - start) * 1000)
+
+    threads = [threading.Thread(target=write)]
+    threads += [threading.Thread(target=read, args=(samples,)) for samples in timings]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    writer.dispose()
+    reader.dispose()
+
+    latencies = [ms for samples in timings for ms in samples]
+    return (
+        settings.sqlite_performance_profile,
+        len(latencies) / seconds,
+        percentile(latencies, 50),
+        percentile(latencies, 99),
+        writes[0] / seconds,
+        errors[0],
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    configured = settings.sqlite_performance_profile
+    results = []
+    try:
+        for profile in ("off", "concurrent"):
+            settings.sqlite_performance_profile = profile
+            with seeded_database(args.rows) as path:
+                results.append(run_profile(path, args.rows, args.readers, args.seconds))
+    finally:
+        settings.sqlite_performance_profile = configured
+
+    report(
+        f"{args.readers} readers and 1 writer for {args.seconds:g}s on {args.rows:,} users",
+        ("profile", "reads/s", "read p50 ms", "read p99 ms", "writes/s", "errors"),
+        results,
+    )
+
+
+if __name__ == "__main__":
+    main()
+{% endif -%}
@@ -0,0 +1,88 @@
+{% if cookiecutter.include_user_model == "yes" -%}
+{% set async_ = "async " if cookiecutter.use_async == "yes" else "" -%}
+{% set await_ = "await " if cookiecutter.use_async == "yes" else "" -%}
+"""
+Per-call overhead of rebuilding CRUD statements vs the prebuilt ones
+
+Looks up one user by ID `--calls` times per sample and reports the median
+cost per call:
+  rebuilt           - select(User).where(User.id == user_id) built every call
+  prebuilt          - crud.get_user, reusing one statement with a bound user_id
+  rebuilt, no cache - rebuilt with the compiled cache off (query_cache_size=0)
+The "statement only" column isolates the Python side: building the statement
+and computing its compiled-cache key, without touching the database.
+
+Usage:
+    python -m benchmarks.statement_cache [--calls 1000] [--repeat 10]
+"""
+import argparse
+{% if cookiecutter.use_async == "yes" -%}
+import asyncio
+{% endif -%}
+import time
+
+from sqlalchemy import select
+
+from benchmarks.common import measure, open_session, report, seeded_database
+from app.crud import user as user_crud
+from app.models import User
+
+
+{{ async_ }}def rebuilt(db, user_id: int):
+    return {{ await_ }}db.scalar(select(User).where(User.id == user_id))
+
+
+{{ async_ }}def prebuilt(db, user_id: int):
+    return {{ await_ }}user_crud.get_user(db, user_id)
+
+
+def statement_cost(build, calls: int) -> float:
+    """Median microseconds to produce a statement and its cache key"""
+    timings = []
+    for _ in range(5):
+        start = time.perf_counter()
+        for user_id in range(calls):
+            build(user_id)._generate_cache_key()
+        timings.append((time.perf_counter() - start) * 1_000_000 / calls)
+    return sorted(timings)[len(timings) // 2]
+
+
+{{ async_ }}def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=1_000)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    cases = [
+        ("rebuilt", rebuilt, {}, lambda user_id: select(User).where(User.id == user_id)),
+        ("prebuilt", prebuilt, {}, lambda user_id: user_crud._USER_BY_ID),
+        ("rebuilt, no cache", rebuilt, {"query_cache_size": 0}, None),
+    ]
+    results = []
+    with seeded_database(args.calls) as path:
+        for name, lookup, engine_options, build in cases:
+            {{ async_ }}with open_session(path, **engine_options) as db:
+                {{ async_ }}def run():
+                    for user_id in range(1, args.calls + 1):
+                        {{ await_ }}lookup(db, user_id)
+                        db.expunge_all()
+
+                {{ await_ }}run()
+                elapsed_ms = {{ await_ }}measure(run, args.repeat)
+            statement_us = statement_cost(build, args.calls) if build else "-"
+            results.append((name, elapsed_ms * 1000 / args.calls, statement_us))
+
+    report(
+        f"User lookup by ID: median cost per call over {args.calls} calls (us)",
+        ("path", "per call", "statement only"),
+        results,
+    )
+
+
+if __name__ == "__main__":
+    {% if cookiecutter.use_async == "yes" -%}
+    asyncio.run(main())
+    {% else -%}
+    main()
+    {% endif -%}
+{% endif -%}
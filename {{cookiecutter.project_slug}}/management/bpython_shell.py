@@ -25,6 +25,11 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from sqlalchemy import select, func, desc
 from sqlalchemy.orm import selectinload
 from app.db.session import SessionLocal, engine, Base
+{% if cookiecutter.use_async == "yes" -%}
+from management.console import interact, run
+{% else -%}
+from management.console import interact
+{% endif -%}
 
 # Import models and CRUD operations if they exist
 try:
@@ -47,6 +52,10 @@ def run_bpython_shell():
     print("- Auto-suggestions as you type")
     print("- Command history (up/down arrows)")
     print("- Inline documentation\n")
+    {%- if cookiecutter.use_async == "yes" %}
+    print("- bpython cannot `await`; run coroutines with `run(...)`:")
+    print("    run(db.execute(select(1)))")
+    {%- endif %}
 
     shell_namespace = {
         'db': SessionLocal(),
@@ -56,6 +65,9 @@ def run_bpython_shell():
         'selectinload': selectinload,
         'Base': Base,
         'engine': engine,
+        {%- if cookiecutter.use_async == "yes" %}
+        'run': run,
+        {%- endif %}
     }
     
     # Add user-related items if User table exists
@@ -92,8 +104,7 @@ def run_bpython_shell():
     except Exception as e:
         print(f"❌ bpython error: {e}")
         print("🔄 Falling back to standard Python shell...")
-        import code
-        code.interact(local=shell_namespace)
+        interact(shell_namespace)
 
 if __name__ == "__main__":
     run_bpython_shell()
@@ -0,0 +1,51 @@
+"""
+Interactive console shared by the management shells
+{%- if cookiecutter.use_async == "yes" %}
+
+The database session is an AsyncSession and the CRUD functions are
+coroutines, so the console accepts top-level `await` (like `python -m asyncio`).
+Every statement runs on the same event loop, which the session's connections
+are bound to. Shells that cannot `await` (bpython) use `run(coroutine)` instead.
+{%- endif %}
+"""
+{% if cookiecutter.use_async == "yes" -%}
+import ast
+import asyncio
+import code
+import inspect
+import types
+
+loop = asyncio.new_event_loop()
+run = loop.run_until_complete
+
+
+class AsyncConsole(code.InteractiveConsole):
+    """InteractiveConsole that runs statements containing `await` on `loop`"""
+
+    def __init__(self, namespace: dict):
+        super().__init__(namespace)
+        self.compile.compiler.flags |= ast.PyCF_ALLOW_TOP_LEVEL_AWAIT
+
+    def runcode(self, code_obj):
+        func = types.FunctionType(code_obj, self.locals)
+        try:
+            result = func()
+            if inspect.iscoroutine(result):
+                run(result)
+        except SystemExit:
+            raise
+        except BaseException:
+            self.showtraceback()
+
+
+def interact(namespace: dict) -> None:
+    """Start the standard console on `namespace`, with top-level await"""
+    AsyncConsole(namespace).interact()
+{% else -%}
+import code
+
+
+def interact(namespace: dict) -> None:
+    """Start the standard console on `namespace`"""
+    code.interact(local=namespace)
+{% endif -%}
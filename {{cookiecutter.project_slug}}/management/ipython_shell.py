@@ -25,6 +25,11 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from sqlalchemy import select, func, desc
 from sqlalchemy.orm import selectinload
 from app.db.session import SessionLocal, engine, Base
+{% if cookiecutter.use_async == "yes" -%}
+from management.console import interact, run
+{% else -%}
+from management.console import interact
+{% endif -%}
 
 # Import models and CRUD operations if they exist
 try:
@@ -47,6 +52,10 @@ def run_ipython_shell():
     print("- Magic commands (%timeit, %debug, etc.)")
     print("- Rich display")
     print("- Better error formatting\n")
+    {%- if cookiecutter.use_async == "yes" %}
+    print("- Top-level await for the AsyncSession `db` and CRUD functions:")
+    print("    await db.execute(select(1))")
+    {%- endif %}
 
     shell_namespace = {
         'db': SessionLocal(),
@@ -77,8 +86,19 @@ def run_ipython_shell():
         print("💡 Add your own models to app/models/ and import them here")
 
     try:
+        {%- if cookiecutter.use_async == "yes" %}
+        # embed() cannot autoawait; a full IPython app can, on the loop `run` drives
+        from IPython.terminal.ipapp import TerminalIPythonApp
+        app = TerminalIPythonApp.instance(user_ns=shell_namespace)
+        app.initialize(argv=[])
+        app.shell.loop_runner = run
+        db = shell_namespace['db']  # IPython clears its namespace on exit
+        app.start()
+        run(db.close())
+        {%- else %}
         from IPython import embed
         embed(user_ns=shell_namespace)
+        {%- endif %}
     except ImportError:
         print("❌ IPython not installed. Installing...")
         import subprocess
@@ -88,8 +108,7 @@ def run_ipython_shell():
     except Exception as e:
         print(f"❌ IPython error: {e}")
         print("🔄 Falling back to standard Python shell...")
-        import code
-        code.interact(local=shell_namespace)
+        interact(shell_namespace)
 
 if __name__ == "__main__":
     run_ipython_shell()
@@ -1,4 +1,5 @@
 #!/usr/bin/env python3
+{% set await_ = "await " if cookiecutter.use_async == "yes" else "" -%}
 """
 FastAPI Boilerplate Interactive Shell
 ====================================
@@ -10,7 +11,7 @@ Usage:
     python management/shell.py
 
 Features:
-- Pre-loaded database session
+- Pre-loaded database session{% if cookiecutter.use_async == "yes" %} (an AsyncSession; top-level `await` works){% endif %}
 - All models imported and ready to use
 - All CRUD functions available
 - Modern SQLAlchemy 2.0 syntax
@@ -26,6 +27,11 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from sqlalchemy import select, func, desc, text
 from sqlalchemy.orm import selectinload
 from app.db.session import SessionLocal, engine, Base
+{% if cookiecutter.use_async == "yes" -%}
+from management.console import interact, run
+{% else -%}
+from management.console import interact
+{% endif -%}
 
 # Import models and CRUD operations if they exist
 try:
@@ -48,7 +54,7 @@ welcome_msg = """
 =======================================
 
 ✨ Pre-loaded with:
-- Database session: `db`
+- Database session: `db`{% if cookiecutter.use_async == "yes" %} (async: `await` its queries and the CRUD functions){% endif %}
 - SQLAlchemy functions: `select`, `func`, `desc`
 - Modern SQLAlchemy 2.0 syntax
 """
@@ -62,22 +68,22 @@ Quick Examples:
 ==============
 
 1. Basic Queries (Modern SQLAlchemy 2.0):
-   user = db.scalar(select(User))
-   users = db.scalars(select(User)).all()
+   user = {{ await_ }}db.scalar(select(User))
+   users = {% if cookiecutter.use_async == "yes" %}(await db.scalars(select(User))).all(){% else %}db.scalars(select(User)).all(){% endif %}
    
 2. Filtered Queries:
-   active_users = db.scalars(select(User).where(User.is_active == True)).all()
-   user_by_email = db.scalar(select(User).where(User.email == "test@example.com"))
+   active_users = {% if cookiecutter.use_async == "yes" %}(await db.scalars(select(User).where(User.is_active == True))).all(){% else %}db.scalars(select(User).where(User.is_active == True)).all(){% endif %}
+   user_by_email = {{ await_ }}db.scalar(select(User).where(User.email == "test@example.com"))
    
 3. CRUD Operations:
-   new_user = create_user(db, UserCreate(name="John", email="john@example.com"))
-   user = get_user(db, user_id=1)
+   new_user = {{ await_ }}create_user(db, UserCreate(name="John", email="john@example.com"))
+   user = {{ await_ }}get_user(db, user_id=1)
    
 4. Count Queries:
-   user_count = db.scalar(select(func.count(User.id)))
+   user_count = {{ await_ }}db.scalar(select(func.count(User.id)))
    
 5. Ordering:
-   users = db.scalars(select(User).order_by(User.created_at.desc())).all()
+   users = {% if cookiecutter.use_async == "yes" %}(await db.scalars(select(User).order_by(User.created_at.desc()))).all(){% else %}db.scalars(select(User).order_by(User.created_at.desc())).all(){% endif %}
 """
 else:
     welcome_msg += """
@@ -89,14 +95,14 @@ Quick Examples:
 
 1. Basic Database Operations:
    # Check database connection
-   db.execute(select(1))
+   {{ await_ }}db.execute(select(1))
    
 2. Create your own models:
    # Add models to app/models/your_model.py
    # Import them here: from app.models.your_model import YourModel
    
 3. Raw SQL queries:
-   result = db.execute(text("SELECT version()"))
+   result = {{ await_ }}db.execute(text("SELECT version()"))
    print(result.scalar())
 """
 
@@ -109,7 +115,10 @@ print(welcome_msg)
 
 # Start interactive shell
 try:
-    import code
-    code.interact(local=locals())
+    interact(locals())
 finally:
+    {%- if cookiecutter.use_async == "yes" %}
+    run(db.close())
+    {%- else %}
     db.close()
+    {%- endif %}
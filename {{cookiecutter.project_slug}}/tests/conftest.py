@@ -2,15 +2,86 @@
 """
 Pytest configuration and fixtures for {{cookiecutter.project_name}}
 """
+{% if cookiecutter.use_async == "yes" -%}
+import asyncio
+{% endif -%}
+{% if cookiecutter.include_user_model == "yes" and cookiecutter.include_authentication == "jwt" -%}
+import uuid
+{% endif -%}
+from contextlib import contextmanager
+
 import pytest
+from fastapi import Request
 from fastapi.testclient import TestClient
+{% if cookiecutter.use_async == "yes" -%}
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+{% else -%}
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+{% endif -%}
+from sqlalchemy.pool import NullPool, StaticPool
 
 from app.main import app
-from app.db.session import Base, get_db
+from app.core import response_cache
+{% if cookiecutter.include_metrics == "yes" -%}
+from app.core.metrics import instrument_engine
+{% endif -%}
+from app.db.query_budget import count_queries, report_queries, setup_query_tracking, track_queries
+from app.db.session import Base, get_db, get_read_db
+from app.db.slow_queries import setup_slow_query_log
+
+{% if cookiecutter.use_async == "yes" -%}
+# Test database URL (in-memory SQLite through aiosqlite)
+SQLALCHEMY_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
+
+# Create test engine
+engine = create_async_engine(
+    SQLALCHEMY_DATABASE_URL,
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool,
+)
+setup_query_tracking(engine.sync_engine)
+setup_slow_query_log(engine.sync_engine)
+{% if cookiecutter.include_metrics == "yes" -%}
+instrument_engine(engine.sync_engine)
+{% endif %}
+# Create test session
+TestingSessionLocal = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+
+
+async def override_get_db(request: Request):
+    """Override database dependency for testing"""
+    async with TestingSessionLocal() as db:
+        track_queries(db, request)
+        try:
+            yield db
+        finally:
+            report_queries(db)
+
+
+async def _create_tables(target=engine):
+    async with target.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+
+async def _drop_tables(target=engine):
+    async with target.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def setup_test_db():
+    """Create test database tables"""
+    asyncio.run(_create_tables())
+    yield
+    asyncio.run(_drop_tables())
+
 
+@pytest.fixture
+def db():
+    """Database session fixture"""
+    return TestingSessionLocal()
+{% else -%}
 # Test database URL (in-memory SQLite)
 SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
 
@@ -20,18 +91,24 @@ engine = create_engine(
     connect_args={"check_same_thread": False},
     poolclass=StaticPool,
 )
-
+setup_query_tracking(engine)
+setup_slow_query_log(engine)
+{% if cookiecutter.include_metrics == "yes" -%}
+instrument_engine(engine)
+{% endif %}
 # Create test session
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 
 
-def override_get_db():
+def override_get_db(request: Request):
     """Override database dependency for testing"""
     try:
         db = TestingSessionLocal()
+        track_queries(db, request)
         yield db
     finally:
         db.close()
+        report_queries(db)
 
 
 @pytest.fixture(scope="session", autouse=True)
@@ -50,14 +127,95 @@ def db():
         yield db
     finally:
         db.close()
+{% endif -%}
 
 
 @pytest.fixture
 def client():
     """Test client fixture"""
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    # Cached responses may belong to another test's database
+    {% if cookiecutter.use_async == "yes" -%}
+    asyncio.run(response_cache.clear())
+    {% else -%}
+    response_cache.clear()
+    {% endif -%}
     with TestClient(app) as test_client:
         yield test_client
     app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def concurrent_db(client: TestClient, tmp_path):
+    """Serve requests from a file-backed SQLite database, one connection per session
+
+    The in-memory test engine shares a single connection between sessions, so
+    tests firing truly concurrent requests need separate connections that
+    serialize on SQLite's file lock instead.
+    """
+    url = f"sqlite{% if cookiecutter.use_async == "yes" %}+aiosqlite{% endif %}:///{tmp_path / 'concurrent.db'}"
+    {% if cookiecutter.use_async == "yes" -%}
+    concurrent_engine = create_async_engine(url, connect_args={"timeout": 30}, poolclass=NullPool)
+    asyncio.run(_create_tables(concurrent_engine))
+    factory = async_sessionmaker(bind=concurrent_engine, autoflush=False, expire_on_commit=False)
+
+    async def override_concurrent_db():
+        async with factory() as db:
+            yield db
+    {% else -%}
+    concurrent_engine = create_engine(
+        url, connect_args={"check_same_thread": False, "timeout": 30}, poolclass=NullPool
+    )
+    Base.metadata.create_all(bind=concurrent_engine)
+    factory = sessionmaker(autoflush=False, expire_on_commit=False, bind=concurrent_engine)
+
+    def override_concurrent_db():
+        with factory() as db:
+            yield db
+    {% endif %}
+    app.dependency_overrides[get_db] = override_concurrent_db
+    app.dependency_overrides[get_read_db] = override_concurrent_db
+    yield
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+
+
+@pytest.fixture
+def assert_num_queries():
+    """Assert the exact number of statements a block runs on the test database
+
+        with assert_num_queries(1):
+            client.get("/api/v1/users/1")
+    """
+    @contextmanager
+    def check(expected: int):
+        with count_queries(engine{% if cookiecutter.use_async == "yes" %}.sync_engine{% endif %}) as tracker:
+            yield tracker
+        assert tracker.count == expected, tracker.describe()
+
+    return check
+{% if cookiecutter.include_user_model == "yes" %}
+
+
+@pytest.fixture
+def auth_headers(client: TestClient):
+    """Headers authenticating requests to protected user endpoints"""
+    {% if cookiecutter.include_authentication == "jwt" -%}
+    username = f"auth_{uuid.uuid4().hex[:12]}"
+    client.post("/api/v1/users/", json={
+        "name": "Auth User",
+        "email": f"{username}@example.com",
+        "username": username,
+        "password": "testpassword",
+    })
+    response = client.post(
+        "/api/v1/users/token", data={"username": username, "password": "testpassword"}
+    )
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+    {% else -%}
+    return {}
+    {% endif -%}
+{% endif %}
 {% endif -%}
 
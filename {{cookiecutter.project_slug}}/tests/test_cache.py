@@ -0,0 +1,92 @@
+{% if cookiecutter.include_testing == "pytest" -%}
+"""
+Test the in-process cache backend and Redis value encoding
+"""
+{% if cookiecutter.use_async == "yes" -%}
+import asyncio
+{% endif -%}
+import json
+import time
+from datetime import datetime, timezone
+
+import pytest
+
+from app.core.cache import MemoryCache, RedisCache
+from app.core.response_cache import CachedResponse
+
+
+def test_memory_cache_lru_eviction():
+    """Test least recently used entries are evicted past maxsize"""
+    cache = MemoryCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_memory_cache_ttl_expiry():
+    """Test entries expire after their TTL"""
+    cache = MemoryCache(maxsize=10, ttl=0.05)
+    cache.set("a", 1)
+    cache.set("b", 2, ttl=60)
+    assert cache.get("a") == 1
+    time.sleep(0.06)
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+
+
+def test_memory_cache_stats():
+    """Test hit/miss counters and invalidation"""
+    cache = MemoryCache(maxsize=10)
+    cache.set("a", 1)
+    cache.get("a")
+    cache.get("missing")
+    cache.delete("a")
+    cache.get("a")
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 2
+    assert stats["hit_ratio"] == 1 / 3
+
+
+class FakeRedis:
+    """The few redis client commands RedisCache uses, kept in a dict"""
+
+    def __init__(self):
+        self.data = {}
+
+    {% if cookiecutter.use_async == "yes" %}async {% endif %}def get(self, key):
+        return self.data.get(key)
+
+    {% if cookiecutter.use_async == "yes" %}async {% endif %}def set(self, key, value, px=None):
+        self.data[key] = value
+
+    {% if cookiecutter.use_async == "yes" %}async {% endif %}def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+
+def test_redis_cache_stores_json():
+    """Test Redis values are JSON validated back into `value_type`, never pickles"""
+    pytest.importorskip("redis")
+    cache = RedisCache("redis://localhost:6379/0", prefix="test:", value_type=CachedResponse)
+    cache._client = FakeRedis()
+    cached = CachedResponse(b'{"id":1}', {"ETag": 'W/"1"'}, datetime(2024, 1, 2, tzinfo=timezone.utc))
+    {% if cookiecutter.use_async == "yes" -%}
+    asyncio.run(cache.set("k", cached))
+    assert json.loads(cache._client.data["test:k"])[0] == '{"id":1}'
+    assert asyncio.run(cache.get("k")) == cached
+    asyncio.run(cache.delete("k"))
+    assert asyncio.run(cache.get("k")) is None
+    {% else -%}
+    cache.set("k", cached)
+    assert json.loads(cache._client.data["test:k"])[0] == '{"id":1}'
+    assert cache.get("k") == cached
+    cache.delete("k")
+    assert cache.get("k") is None
+    {% endif -%}
+{% endif -%}
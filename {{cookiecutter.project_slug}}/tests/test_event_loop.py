@@ -0,0 +1,73 @@
+{% if cookiecutter.include_testing == "pytest" and cookiecutter.include_user_model == "yes" and cookiecutter.include_authentication == "jwt" -%}
+"""
+Regression tests: serving authenticated requests must not block the event loop
+"""
+import asyncio
+import time
+
+import httpx
+from fastapi.testclient import TestClient
+{% if cookiecutter.use_async == "no" -%}
+from sqlalchemy import event
+{% endif %}
+from app.main import app
+{% if cookiecutter.use_async == "no" -%}
+from tests.conftest import engine
+{% endif %}
+# Longest the event loop may go without running a heartbeat
+MAX_LOOP_STALL_SECONDS = 0.05
+HEARTBEAT_INTERVAL = 0.005
+{% if cookiecutter.use_async == "no" -%}
+# Simulated DB latency per statement; a handler doing DB I/O on the loop
+# thread would stall the loop for at least this long
+SIMULATED_QUERY_SECONDS = 0.1
+{% endif %}
+
+async def _max_loop_stall(work) -> float:
+    """Await `work` while measuring the longest gap between heartbeats"""
+    stalls = []
+    done = asyncio.Event()
+
+    async def heartbeat():
+        last = time.perf_counter()
+        while not done.is_set():
+            await asyncio.sleep(HEARTBEAT_INTERVAL)
+            now = time.perf_counter()
+            stalls.append(now - last - HEARTBEAT_INTERVAL)
+            last = now
+
+    task = asyncio.create_task(heartbeat())
+    await work
+    done.set()
+    await task
+    return max(stalls)
+
+
+async def _authenticated_requests(headers: dict, count: int) -> None:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        responses = await asyncio.gather(
+            *(client.get("/api/v1/users/me", headers=headers) for _ in range(count))
+        )
+    assert all(response.status_code == 200 for response in responses)
+
+
+{% if cookiecutter.use_async == "no" -%}
+def _slow_query(conn, cursor, statement, parameters, context, executemany):
+    time.sleep(SIMULATED_QUERY_SECONDS)
+
+
+{% endif -%}
+def test_auth_dependency_does_not_block_event_loop(client: TestClient, auth_headers: dict):
+    """Test the auth dependency chain keeps the event loop responsive"""
+    {% if cookiecutter.use_async == "no" -%}
+    event.listen(engine, "before_cursor_execute", _slow_query)
+    try:
+        stall = asyncio.run(_max_loop_stall(_authenticated_requests(auth_headers, 5)))
+    finally:
+        event.remove(engine, "before_cursor_execute", _slow_query)
+    {% else -%}
+    stall = asyncio.run(_max_loop_stall(_authenticated_requests(auth_headers, 5)))
+    {% endif -%}
+    assert stall < MAX_LOOP_STALL_SECONDS, f"event loop blocked for {stall * 1000:.0f} ms"
+{% endif -%}
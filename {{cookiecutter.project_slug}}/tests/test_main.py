@@ -25,6 +25,40 @@ def test_health_check(client: TestClient):
     assert data["project"] == "{{cookiecutter.project_name}}"
 
 
+def test_db_pool_status(client: TestClient):
+    """Test connection pool occupancy endpoint"""
+    response = client.get("/admin/db/pool")
+    assert response.status_code == 200
+    data = response.json()
+    assert "pool_class" in data
+    if "size" in data:
+        assert data["checked_out"] >= 0
+        assert data["overflow"] >= 0
+        assert data["waiters"] == 0
+
+
+{% if cookiecutter.json_response != "stdlib" -%}
+def test_fast_json_response(client: TestClient):
+    """Test the default response class renders plain data, including nested pydantic models"""
+    from datetime import datetime
+    from pydantic import BaseModel
+    from app.core.responses import FastJSONResponse
+    from app.main import app
+
+    class Item(BaseModel):
+        name: str
+        created_at: datetime
+
+    item = Item(name="x", created_at=datetime(2024, 1, 2, 3, 4, 5))
+    body = FastJSONResponse({"items": [item], 1: None}).body
+    assert body.startswith(b'{"items":[{"name":"x","created_at":"2024-01-02T03:04:05"}]')
+
+    response = client.get("/health")
+    assert response.headers["content-type"] == "application/json"
+    assert app.router.default_response_class is FastJSONResponse
+
+
+{% endif -%}
 def test_docs_redirect(client: TestClient):
     """Test that docs endpoint is accessible"""
     response = client.get("/docs")
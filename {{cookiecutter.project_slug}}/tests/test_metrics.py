@@ -0,0 +1,45 @@
+{% if cookiecutter.include_testing == "pytest" -%}
+"""
+Test the Prometheus metrics endpoint and instrumentation
+"""
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+
+def _sample(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_metrics_exposition(client: TestClient):
+    """Test /metrics serves request, query and pool metrics in the text format"""
+    client.get("/health")
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert 'http_requests_total{method="GET",route="/health",status="200"}' in body
+    assert "http_request_duration_seconds_bucket" in body
+    assert "http_requests_in_progress" in body
+    assert "db_query_duration_seconds_count" in body
+    assert "db_pool_" in body
+
+
+def test_request_metrics_by_route_template(client: TestClient):
+    """Test requests are labelled by route template and status code"""
+    before = _sample("http_requests_total", method="GET", route="unmatched", status="404")
+    client.get("/no/such/path")
+    assert _sample("http_requests_total", method="GET", route="unmatched", status="404") == before + 1
+    assert _sample("http_requests_in_progress") == 0
+{% if cookiecutter.include_user_model == "yes" %}
+
+def test_request_query_counts(client: TestClient, auth_headers: dict):
+    """Test statements executed while serving a request are counted against its route"""
+    labels = {"method": "GET", "route": "/api/v1/users/{user_id}"}
+    count_before = _sample("http_request_db_queries_count", **labels)
+    sum_before = _sample("http_request_db_queries_sum", **labels)
+    response = client.get("/api/v1/users/999999", headers=auth_headers)
+    assert response.status_code == 404
+    assert _sample("http_request_db_queries_count", **labels) == count_before + 1
+    assert _sample("http_request_db_queries_sum", **labels) >= sum_before + 1
+{% endif -%}
+{% endif -%}
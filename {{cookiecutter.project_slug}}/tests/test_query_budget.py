@@ -0,0 +1,125 @@
+{% if cookiecutter.include_testing == "pytest" -%}
+"""
+Test per-request query counting, budgets and N+1 detection
+"""
+import logging
+
+import pytest
+from fastapi import Request
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.query_budget import (
+    QueryBudgetExceeded,
+    QueryTracker,
+    count_queries,
+    report_queries,
+    setup_query_tracking,
+    track_queries,
+)
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    setup_query_tracking(engine)
+    yield engine
+    engine.dispose()
+
+
+def test_tracker_counts_session_statements(engine):
+    """Statements run through a tracked session are counted, others are not"""
+    tracker = QueryTracker("test")
+    with Session(engine) as db:
+        db.info["query_tracker"] = tracker
+        db.execute(text("SELECT 1"))
+        db.commit()
+        db.execute(text("SELECT 2"))
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 3"))
+    assert tracker.count == 2
+
+
+def test_tracker_reports_budget_and_repeats(engine, caplog):
+    """Overruns and repeated statement shapes are logged as likely N+1"""
+    tracker = QueryTracker("list_things", budget=3)
+    with Session(engine) as db:
+        db.info["query_tracker"] = tracker
+        for value in range(6):
+            db.execute(text("SELECT :value"), {"value": value})
+    with caplog.at_level(logging.WARNING, logger="app.sql.budget"):
+        tracker.report()
+    messages = [record.getMessage() for record in caplog.records]
+    assert "list_things ran 6 queries (budget 3)" in messages
+    assert any("6 times (possible N+1): SELECT ?" in message for message in messages)
+
+
+def test_tracker_raises_over_budget(engine):
+    """With raise_on_exceed the statement over budget fails"""
+    with Session(engine) as db:
+        db.info["query_tracker"] = QueryTracker("test", budget=1, raise_on_exceed=True)
+        db.execute(text("SELECT 1"))
+        with pytest.raises(QueryBudgetExceeded):
+            db.execute(text("SELECT 2"))
+
+
+@pytest.fixture
+def replica():
+    replica = create_engine("sqlite://")
+    setup_query_tracking(replica)
+    yield replica
+    replica.dispose()
+
+
+def _request_for(route: str) -> Request:
+    def endpoint():
+        pass
+
+    endpoint.__name__ = route
+    return Request({"type": "http", "path": "/", "headers": [], "query_string": b"", "endpoint": endpoint})
+
+
+def test_request_sessions_share_one_budget(engine, replica, monkeypatch):
+    """Primary and replica sessions of one request count against the same budget"""
+    monkeypatch.setattr(settings, "query_budget_mode", "raise")
+    monkeypatch.setattr(settings, "query_budgets", {"get_users": 2})
+    request = _request_for("get_users")
+    with Session(engine) as primary, Session(replica) as read:
+        track_queries(primary, request)
+        track_queries(read, request)
+        primary.execute(text("SELECT 1"))
+        read.execute(text("SELECT 2"))
+        with pytest.raises(QueryBudgetExceeded):
+            read.execute(text("SELECT 3"))
+
+
+def test_request_sessions_report_once(engine, replica, monkeypatch, caplog):
+    """The request's tracker is reported when its last session stops counting"""
+    monkeypatch.setattr(settings, "query_budget_mode", "log")
+    monkeypatch.setattr(settings, "query_budgets", {"get_users": 2})
+    request = _request_for("get_users")
+    with Session(engine) as primary, Session(replica) as read:
+        track_queries(primary, request)
+        track_queries(read, request)
+        primary.execute(text("SELECT 1"))
+        read.execute(text("SELECT 2"))
+        read.execute(text("SELECT 3"))
+        with caplog.at_level(logging.WARNING, logger="app.sql.budget"):
+            report_queries(read)
+            assert caplog.records == []
+            report_queries(primary)
+    assert request.state.query_tracker.count == 3
+    assert [record.getMessage() for record in caplog.records] == ["get_users ran 3 queries (budget 2)"]
+
+
+def test_count_queries(engine):
+    """count_queries counts only inside the block"""
+    with engine.connect() as conn:
+        with count_queries(engine) as tracker:
+            conn.execute(text("SELECT 1"))
+            conn.execute(text("SELECT 1"))
+        conn.execute(text("SELECT 1"))
+    assert tracker.count == 2
+    assert tracker.statements["SELECT 1"] == 2
+{% endif -%}
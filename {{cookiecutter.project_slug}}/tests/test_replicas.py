@@ -0,0 +1,212 @@
+{% if cookiecutter.include_testing == "pytest" and cookiecutter.include_user_model == "yes" -%}
+"""
+Test read-replica routing, read-your-writes stickiness and replica fallback
+"""
+{% if cookiecutter.use_async == "yes" -%}
+import asyncio
+{% endif -%}
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, insert
+{% if cookiecutter.use_async == "yes" -%}
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+{% else -%}
+from sqlalchemy.orm import sessionmaker
+{% endif -%}
+from sqlalchemy.pool import NullPool
+
+from app import main
+from app.core.config import settings
+from app.db import replicas, session
+from app.db.query_budget import count_queries
+from app.db.replicas import Replica, ReplicaSet, RoutingSession
+from app.db.session import Base, get_db, get_read_db
+from app.main import app
+from app.models.user import User
+
+REPLICA_EMAIL = "replica-only@example.com"
+
+
+def _database(path, marker: bool = False):
+    """Create the schema in SQLite file `path`, optionally with a row only this file has"""
+    setup_engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(setup_engine)
+    if marker:
+        with setup_engine.begin() as conn:
+            conn.execute(insert(User).values(
+                name="Replica Only",
+                email=REPLICA_EMAIL,
+                {%- if cookiecutter.include_authentication == "jwt" %}
+                username="replica_only",
+                hashed_password="x",
+                {%- endif %}
+            ))
+    setup_engine.dispose()
+    {%- if cookiecutter.use_async == "yes" %}
+    return create_async_engine(f"sqlite+aiosqlite:///{path}", connect_args={"timeout": 30}, poolclass=NullPool)
+    {%- else %}
+    return create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False, "timeout": 30}, poolclass=NullPool)
+    {%- endif %}
+
+
+def _forget_writes() -> None:
+    """End every read-your-writes window, as if DB_READ_YOUR_WRITES_SECONDS had passed"""
+    {%- if cookiecutter.use_async == "yes" %}
+    asyncio.run(replicas._recent_writers.clear())
+    {%- else %}
+    replicas._recent_writers.clear()
+    {%- endif %}
+
+
+@pytest.fixture
+def replicated(client: TestClient, tmp_path, monkeypatch):
+    """Serve requests through the real get_db / get_read_db from a primary and a replica file
+
+    The replica holds one row the primary lacks, so responses show which
+    database answered.
+    """
+    primary = _database(tmp_path / "primary.db")
+    replica_set = ReplicaSet([Replica(_database(tmp_path / "replica.db", marker=True))])
+    {%- if cookiecutter.use_async == "yes" %}
+    factory = async_sessionmaker(
+        bind=primary, sync_session_class=RoutingSession, autoflush=False, expire_on_commit=False
+    )
+    {%- else %}
+    factory = sessionmaker(class_=RoutingSession, autoflush=False, expire_on_commit=False, bind=primary)
+    {%- endif %}
+    monkeypatch.setattr(session, "SessionLocal", factory)
+    monkeypatch.setattr(session, "replica_set", replica_set)
+    app.dependency_overrides.pop(get_db)
+    app.dependency_overrides.pop(get_read_db)
+    _forget_writes()
+    yield replica_set
+    _forget_writes()
+
+
+def _emails(client: TestClient, headers: dict, **params) -> set:
+    response = client.get("/api/v1/users/", headers=headers, params=params)
+    assert response.status_code == 200
+    return {user["email"] for user in response.json()}
+
+
+def test_reads_go_to_replica(client: TestClient, replicated, auth_headers: dict):
+    """Read-only endpoints are served from the replica"""
+    assert REPLICA_EMAIL in _emails(client, auth_headers)
+    assert replicated.replicas[0].healthy
+
+
+def _write(client: TestClient, headers: dict) -> None:
+    response = client.post("/api/v1/users/", headers=headers, json={
+        "name": "Fresh Write",
+        "email": "fresh@example.com",
+        {%- if cookiecutter.include_authentication == "jwt" %}
+        "username": "fresh_write",
+        "password": "testpassword",
+        {%- endif %}
+    })
+    assert response.status_code == 201
+
+
+def _other_client_headers(client: TestClient) -> dict:
+    """Headers identifying a second client for read-your-writes"""
+    {%- if cookiecutter.include_authentication == "jwt" %}
+    client.post("/api/v1/users/", json={
+        "name": "Other Client",
+        "email": "other@example.com",
+        "username": "other_client",
+        "password": "testpassword",
+    })
+    response = client.post("/api/v1/users/token", data={"username": "other_client", "password": "testpassword"})
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+    {%- else %}
+    return {"Authorization": "Bearer other-client"}
+    {%- endif %}
+
+
+def test_read_your_writes(client: TestClient, replicated, auth_headers: dict):
+    """A client that just wrote reads from the primary until the window passes"""
+    _write(client, auth_headers)
+    emails = _emails(client, auth_headers)
+    assert "fresh@example.com" in emails
+    assert REPLICA_EMAIL not in emails
+
+    # Once the window expires the replica (which never saw the write) serves
+    # reads again; a new query variant keeps the cached primary page out of it
+    _forget_writes()
+    emails = _emails(client, auth_headers, limit=50)
+    assert REPLICA_EMAIL in emails
+    assert "fresh@example.com" not in emails
+
+
+def test_read_your_writes_through_response_cache(client: TestClient, replicated, auth_headers: dict):
+    """Another client's lagging replica read is neither cached nor served to the writer"""
+    other_headers = _other_client_headers(client)
+    _write(client, auth_headers)
+
+    # The other client still reads the replica, which has not seen the write
+    assert "fresh@example.com" not in _emails(client, other_headers)
+    assert "fresh@example.com" in _emails(client, auth_headers)
+    # The writer's primary read is current, so it may be cached for everyone
+    assert "fresh@example.com" in _emails(client, other_headers)
+
+
+def test_unreachable_replica_falls_back_to_primary(client: TestClient, replicated, tmp_path, auth_headers: dict):
+    """A replica failing its health check is skipped in favour of the primary"""
+    {%- if cookiecutter.use_async == "yes" %}
+    broken = Replica(create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'missing' / 'replica.db'}"))
+    {%- else %}
+    broken = Replica(create_engine(f"sqlite:///{tmp_path / 'missing' / 'replica.db'}"))
+    {%- endif %}
+    replicated.replicas = [broken]
+    assert REPLICA_EMAIL not in _emails(client, auth_headers)
+    assert not broken.healthy
+
+
+def test_warm_statement_cache_on_replicas(replicated, tmp_path, monkeypatch):
+    """Startup warm-up compiles the read statements on every replica; unreachable ones are marked unhealthy"""
+    {%- if cookiecutter.use_async == "yes" %}
+    broken = Replica(create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'missing' / 'replica.db'}"))
+    {%- else %}
+    broken = Replica(create_engine(f"sqlite:///{tmp_path / 'missing' / 'replica.db'}"))
+    {%- endif %}
+    replicated.replicas.append(broken)
+    monkeypatch.setattr(settings, "db_warm_statement_cache", True)
+    monkeypatch.setattr(main, "SessionLocal", session.SessionLocal)
+    monkeypatch.setattr(main, "replica_set", replicated)
+
+    with count_queries(replicated.replicas[0].bind) as tracker:
+        {%- if cookiecutter.use_async == "yes" %}
+        asyncio.run(main._warm_statement_cache())
+        {%- else %}
+        main._warm_statement_cache()
+        {%- endif %}
+    assert tracker.count == {% if cookiecutter.include_authentication == "jwt" %}5{% else %}4{% endif %}
+    assert not broken.healthy
+
+
+def test_replica_strategies(tmp_path):
+    """Round robin rotates through healthy replicas; least connections picks the idlest"""
+    first, second = (Replica(_database(tmp_path / f"replica{n}.db")) for n in (1, 2))
+    for replica in (first, second):
+        replica.record_check(True)
+
+    def choose(replica_set):
+        {%- if cookiecutter.use_async == "yes" %}
+        return asyncio.run(replica_set.choose())
+        {%- else %}
+        return replica_set.choose()
+        {%- endif %}
+
+    round_robin = ReplicaSet([first, second])
+    assert [choose(round_robin) for _ in range(3)] == [first, second, first]
+
+    first.healthy = False
+    assert [choose(round_robin) for _ in range(2)] == [second, second]
+    first.healthy = True
+
+    least_connections = ReplicaSet([first, second], strategy="least_connections")
+    first.in_use = 2
+    assert choose(least_connections) is second
+    second.in_use = 3
+    assert choose(least_connections) is first
+{% endif -%}
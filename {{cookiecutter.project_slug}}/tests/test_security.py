@@ -0,0 +1,47 @@
+{% if cookiecutter.include_testing == "pytest" and cookiecutter.include_authentication == "jwt" -%}
+"""
+Test JWT encoding, verification and the verified-claims cache
+"""
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core import security
+from app.core.security import InvalidTokenError, decode_access_token, encode_access_token
+
+
+def _token(**delta) -> str:
+    expire = datetime.utcnow() + timedelta(**delta)
+    return encode_access_token({"sub": f"user-{time.monotonic_ns()}", "exp": expire})
+
+
+def test_decode_access_token_caches_claims():
+    """Test a repeated token is served from the claims cache"""
+    token = _token(minutes=5)
+    before = security._token_cache.stats()
+    first = decode_access_token(token)
+    second = decode_access_token(token)
+    after = security._token_cache.stats()
+    assert first == second
+    assert after["misses"] == before["misses"] + 1
+    assert after["hits"] == before["hits"] + 1
+
+
+def test_decode_access_token_rejects_tampered_and_expired_tokens():
+    """Test invalid signatures and expired tokens are rejected"""
+    token = _token(minutes=5)
+    with pytest.raises(InvalidTokenError):
+        decode_access_token(token[:-2] + ("AA" if not token.endswith("AA") else "BB"))
+    with pytest.raises(InvalidTokenError):
+        decode_access_token(_token(seconds=-10))
+
+
+@pytest.mark.parametrize("backend", sorted(security.JWT_BACKENDS))
+def test_jwt_backends_interoperate(backend: str):
+    """Test every backend verifies tokens signed by the configured one"""
+    encode, decode = security.get_jwt_backend(backend)
+    token = _token(minutes=5)
+    assert decode(token)["sub"] == decode_access_token(token)["sub"]
+    assert decode_access_token(encode({"sub": "alice", "exp": datetime.utcnow() + timedelta(minutes=5)}))["sub"] == "alice"
+{% endif -%}
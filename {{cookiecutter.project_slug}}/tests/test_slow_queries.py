@@ -0,0 +1,103 @@
+{% if cookiecutter.include_testing == "pytest" -%}
+"""
+Test the slow-query log and its admin pages
+"""
+import logging
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import bindparam, create_engine, text
+
+from app.core.config import settings
+from app.db.slow_queries import (
+    clear_slow_queries,
+    explain_slow_queries,
+    get_slow_queries,
+    normalize_statement,
+    parameter_shape,
+    setup_slow_query_log,
+)
+from app.db.sql_logging import setup_sql_logging
+
+
+@pytest.fixture
+def record_all(monkeypatch):
+    """Record every statement as slow, starting from an empty log"""
+    monkeypatch.setattr(settings, "slow_query_threshold_ms", 0)
+    clear_slow_queries()
+    yield
+    clear_slow_queries()
+
+
+def test_normalize_statement():
+    """Whitespace, IN lists and multi-row VALUES collapse to one shape"""
+    assert normalize_statement("SELECT *\n  FROM users WHERE id IN (?, ?, ?)") == "SELECT * FROM users WHERE id IN (...)"
+    assert normalize_statement("SELECT * FROM users WHERE id IN ($1, $2)") == "SELECT * FROM users WHERE id IN (...)"
+    assert normalize_statement("INSERT INTO t (a, b) VALUES (?, ?), (?, ?)") == "INSERT INTO t (a, b) VALUES (...), ..."
+
+
+def test_parameter_shape():
+    """Parameter types are recorded, never values"""
+    assert parameter_shape(("secret@example.com", 5)) == "(str, int)"
+    assert parameter_shape({"email": "secret@example.com"}) == "{email: str}"
+    assert parameter_shape([(1,), (2,)], executemany=True) == "2 rows of (int)"
+    assert parameter_shape(tuple(range(50))) == "(50 x int)"
+
+
+def test_statement_timed_once(record_all, monkeypatch, caplog):
+    """SQL logging and the slow-query log report one shared measurement per statement"""
+    monkeypatch.setattr(settings, "sql_log_mode", "all")
+    engine = create_engine("sqlite://")
+    setup_sql_logging(engine)
+    setup_slow_query_log(engine)
+    assert len(engine.dispatch.before_cursor_execute) == 1
+    with caplog.at_level(logging.INFO, logger="app.sql"):
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+    logged_ms, statement = caplog.records[-1].getMessage()[1:].split(" ms] ", 1)
+    assert statement.startswith("SELECT 1")
+    # The log shows one decimal, the slow-query log three
+    assert abs(float(logged_ms) - get_slow_queries()[0]["duration_ms"]) <= 0.051
+
+
+def test_slow_queries_recorded_with_plan(record_all, monkeypatch):
+    """Statements over the threshold are recorded and can be explained later"""
+    monkeypatch.setattr(settings, "slow_query_explain", True)
+    engine = create_engine("sqlite://")
+    setup_slow_query_log(engine)
+    with engine.connect() as conn:
+        conn.execute(text("CREATE TABLE things (id INTEGER PRIMARY KEY, name TEXT)"))
+        stmt = text("SELECT name FROM things WHERE id IN :ids").bindparams(bindparam("ids", expanding=True))
+        conn.execute(stmt, {"ids": [1, 2, 3]})
+    entry = get_slow_queries()[0]
+    assert entry["statement"] == "SELECT name FROM things WHERE id IN (...)"
+    assert entry["parameters"] == "(3 x int)"
+    assert entry["plan"] is None
+
+    with engine.connect() as conn:
+        explain_slow_queries(conn)
+    plan = get_slow_queries()[0]["plan"]
+    assert "things" in plan and "failed" not in plan
+    engine.dispose()
+
+
+def test_slow_query_admin_pages(client: TestClient, record_all):
+    """The dashboard lists recorded statements with their calling route"""
+    client.get("/health")
+    response = client.get("/admin/db/slow-queries")
+    assert response.status_code == 200
+    assert isinstance(response.json(), list)
+
+    response = client.get("/admin/slow-queries")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/html")
+    assert "<h1>Slow queries</h1>" in response.text
+{% if cookiecutter.include_user_model == "yes" %}
+
+def test_slow_query_route(client: TestClient, auth_headers: dict, record_all):
+    """Statements run while serving a request are attributed to its endpoint"""
+    client.get("/api/v1/users/999999", headers=auth_headers)
+    routes = {entry["route"] for entry in client.get("/admin/db/slow-queries").json()}
+    assert "get_user" in routes
+{% endif -%}
+{% endif -%}
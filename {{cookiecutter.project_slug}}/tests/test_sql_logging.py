@@ -0,0 +1,50 @@
+{% if cookiecutter.include_testing == "pytest" -%}
+"""
+Test SQL statement logging modes
+"""
+import logging
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from app.core.config import settings
+from app.db.sql_logging import setup_sql_logging
+
+
+def _run_statements(mode: str, count: int, caplog, **overrides) -> int:
+    """Execute `count` statements under `mode` and return how many were logged"""
+    engine = create_engine("sqlite://")
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(settings, "sql_log_mode", mode)
+        for name, value in overrides.items():
+            mp.setattr(settings, name, value)
+        setup_sql_logging(engine)
+    caplog.clear()
+    with caplog.at_level(logging.INFO, logger="app.sql"):
+        with engine.connect() as conn:
+            for _ in range(count):
+                conn.execute(text("SELECT 1"))
+    engine.dispose()
+    return len([r for r in caplog.records if r.name == "app.sql"])
+
+
+def test_sql_logging_off(caplog):
+    """No statements are logged when SQL_LOG_MODE=off"""
+    assert _run_statements("off", 10, caplog) == 0
+
+
+def test_sql_logging_all(caplog):
+    """Every statement is logged when SQL_LOG_MODE=all"""
+    assert _run_statements("all", 10, caplog) == 10
+
+
+def test_sql_logging_sampled(caplog):
+    """One in N statements is logged when SQL_LOG_MODE=sampled"""
+    assert _run_statements("sampled", 10, caplog, sql_log_sample_rate=5) == 2
+
+
+def test_sql_logging_slow(caplog):
+    """Only statements above the threshold are logged when SQL_LOG_MODE=slow"""
+    assert _run_statements("slow", 10, caplog, sql_log_slow_threshold_ms=10_000) == 0
+    assert _run_statements("slow", 10, caplog, sql_log_slow_threshold_ms=0) == 10
+{% endif -%}
@@ -2,10 +2,23 @@
 """
 Test user endpoints
 """
+import asyncio
+import csv
+import io
+import json
+import uuid
+
+import httpx
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
+from app.core.pagination import encode_cursor
+from app.crud import user as user_crud
+from app.db.query_budget import QueryBudgetExceeded
+from app.main import app
+
 
 def test_create_user(client: TestClient, db: Session):
     """Test user creation"""
@@ -85,6 +98,388 @@ def test_get_nonexistent_user(client: TestClient):
     assert response.status_code == 404
 
 
+def _create_users(client: TestClient, count: int) -> list:
+    """Create `count` users with unique emails and return their IDs"""
+    ids = []
+    for _ in range(count):
+        suffix = uuid.uuid4().hex[:12]
+        response = client.post("/api/v1/users/", json={
+            "name": "Page User",
+            "email": f"page_{suffix}@example.com",
+            {% if cookiecutter.include_authentication == "jwt" -%}
+            "username": f"page_{suffix}",
+            "password": "testpassword",
+            {% endif -%}
+        })
+        ids.append(response.json()["id"])
+    return ids
+
+
+def test_get_users_cursor_pagination(client: TestClient, auth_headers: dict):
+    """Test keyset pagination walks all users without gaps or repeats"""
+    created_ids = _create_users(client, 5)
+
+    seen = []
+    response = client.get("/api/v1/users/?limit=2", headers=auth_headers)
+    while True:
+        assert response.status_code == 200
+        seen.extend(user["id"] for user in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+        response = client.get(f"/api/v1/users/?limit=2&cursor={cursor}", headers=auth_headers)
+
+    assert seen == sorted(seen)
+    assert len(seen) == len(set(seen))
+    assert set(created_ids) <= set(seen)
+
+
+def test_get_users_offset_matches_cursor(client: TestClient, auth_headers: dict):
+    """Test offset and cursor modes return the same second page"""
+    _create_users(client, 4)
+    first = client.get("/api/v1/users/?limit=2", headers=auth_headers)
+    cursor = first.headers["X-Next-Cursor"]
+    by_cursor = client.get(f"/api/v1/users/?limit=2&cursor={cursor}", headers=auth_headers)
+    by_offset = client.get("/api/v1/users/?limit=2&skip=2", headers=auth_headers)
+    assert by_cursor.json() == by_offset.json()
+
+
+def test_get_users_filters_and_sort(client: TestClient, auth_headers: dict):
+    """Test prefix / is_active filters, descending sort and rejected sort keys"""
+    prefix = f"Filter {uuid.uuid4().hex[:8]}"
+    for i, name in enumerate(("b", "a", "c")):
+        suffix = uuid.uuid4().hex[:12]
+        client.post("/api/v1/users/", json={
+            "name": f"{prefix} {name}",
+            "email": f"filter_{suffix}@example.com",
+            "is_active": i != 2,
+            {% if cookiecutter.include_authentication == "jwt" -%}
+            "username": f"filter_{suffix}",
+            "password": "testpassword",
+            {% endif -%}
+        })
+
+    response = client.get(f"/api/v1/users/?name_prefix={prefix}&sort=-name", headers=auth_headers)
+    assert response.status_code == 200
+    assert [user["name"][-1] for user in response.json()] == ["c", "b", "a"]
+
+    response = client.get(
+        f"/api/v1/users/?name_prefix={prefix}&is_active=true&sort=name&count=exact", headers=auth_headers
+    )
+    assert [user["name"][-1] for user in response.json()] == ["a", "b"]
+    assert response.headers["X-Total-Count"] == "2"
+
+    response = client.get("/api/v1/users/?sort=is_active", headers=auth_headers)
+    assert response.status_code == 400
+    cursor = client.get("/api/v1/users/?limit=1", headers=auth_headers).headers["X-Next-Cursor"]
+    response = client.get(f"/api/v1/users/?sort=name&cursor={cursor}", headers=auth_headers)
+    assert response.status_code == 400
+
+
+def test_get_users_matches_user_detail(client: TestClient, auth_headers: dict):
+    """Test the Core-row list path serializes users exactly like the ORM detail path"""
+    user_id = _create_users(client, 1)[0]
+    listed = client.get(f"/api/v1/users/?cursor={encode_cursor(user_id - 1)}&limit=1", headers=auth_headers).json()
+    detail = client.get(f"/api/v1/users/{user_id}", headers=auth_headers).json()
+    assert listed == [detail]
+
+
+def test_get_users_sparse_fieldset(client: TestClient, auth_headers: dict):
+    """Test ?fields= returns only the requested columns plus id"""
+    user_id = _create_users(client, 2)[-1]
+    response = client.get("/api/v1/users/?limit=2&fields=email", headers=auth_headers)
+    assert response.status_code == 200
+    assert all(set(user) == {"id", "email"} for user in response.json())
+    assert "X-Next-Cursor" in response.headers
+
+    response = client.get(f"/api/v1/users/{user_id}?fields=name,created_at", headers=auth_headers)
+    assert response.status_code == 200
+    assert set(response.json()) == {"id", "name", "created_at"}
+
+    response = client.get("/api/v1/users/?fields=email,hashed_password", headers=auth_headers)
+    assert response.status_code == 400
+
+
+def test_get_users_total_count(client: TestClient, auth_headers: dict):
+    """Test X-Total-Count is opt-in, exact on request and cached when estimated"""
+    response = client.get("/api/v1/users/?limit=1", headers=auth_headers)
+    assert "X-Total-Count" not in response.headers
+
+    _create_users(client, 2)
+    exact = client.get("/api/v1/users/?limit=1&count=exact", headers=auth_headers)
+    total = int(exact.headers["X-Total-Count"])
+    assert total >= 2
+    assert total == len(client.get(f"/api/v1/users/?limit={total + 10}", headers=auth_headers).json())
+
+    _create_users(client, 1)
+    estimated = client.get("/api/v1/users/?limit=1&count=estimated", headers=auth_headers)
+    assert int(estimated.headers["X-Total-Count"]) == total
+    exact = client.get("/api/v1/users/?limit=1&count=exact", headers=auth_headers)
+    assert int(exact.headers["X-Total-Count"]) == total + 1
+
+
+def test_get_users_page_size_limits(client: TestClient, auth_headers: dict):
+    """Test page size is bounded and invalid cursors are rejected"""
+    response = client.get("/api/v1/users/?limit=100000", headers=auth_headers)
+    assert response.status_code == 422
+    response = client.get("/api/v1/users/?cursor=not-a-cursor", headers=auth_headers)
+    assert response.status_code == 400
+
+
+def test_update_user(client: TestClient, auth_headers: dict):
+    """Test updating a user returns the updated row"""
+    user_id = _create_users(client, 1)[0]
+    response = client.put(
+        f"/api/v1/users/{user_id}", json={"name": "Renamed User"}, headers=auth_headers
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["id"] == user_id
+    assert data["name"] == "Renamed User"
+    assert data["updated_at"] is not None
+
+    response = client.get(f"/api/v1/users/{user_id}", headers=auth_headers)
+    assert response.json()["name"] == "Renamed User"
+
+
+def test_get_user_conditional_requests(client: TestClient, auth_headers: dict):
+    """Test ETag / Last-Modified validators yield 304s until the user changes"""
+    user_id = _create_users(client, 1)[0]
+    response = client.get(f"/api/v1/users/{user_id}", headers=auth_headers)
+    etag = response.headers["ETag"]
+    last_modified = response.headers["Last-Modified"]
+    assert etag.startswith('W/"')
+    assert response.headers["Cache-Control"] == "private, no-cache"
+
+    response = client.get(f"/api/v1/users/{user_id}", headers={**auth_headers, "If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+    response = client.get(
+        f"/api/v1/users/{user_id}", headers={**auth_headers, "If-Modified-Since": last_modified}
+    )
+    assert response.status_code == 304
+
+    # Each sparse fieldset is its own representation
+    response = client.get(
+        f"/api/v1/users/{user_id}?fields=email", headers={**auth_headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+    client.put(f"/api/v1/users/{user_id}", json={"name": "Changed"}, headers=auth_headers)
+    response = client.get(f"/api/v1/users/{user_id}", headers={**auth_headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["name"] == "Changed"
+    assert response.headers["ETag"] != etag
+
+
+def test_etag_changes_on_writes_within_one_second(client: TestClient, auth_headers: dict):
+    """Test the row version changes the ETag even when updated_at cannot"""
+    user_id = _create_users(client, 1)[0]
+    etags = []
+    for name in ("First", "Second", "Third"):
+        client.put(f"/api/v1/users/{user_id}", json={"name": name}, headers=auth_headers)
+        response = client.get(f"/api/v1/users/{user_id}", headers=auth_headers)
+        assert response.json()["name"] == name
+        etags.append(response.headers["ETag"])
+    assert len(set(etags)) == 3
+    assert response.json()["version"] == 4
+
+
+def test_response_cache_hits(client: TestClient, auth_headers: dict):
+    """Test repeated reads of a user and a list page are served from the response cache"""
+    user_id = _create_users(client, 1)[0]
+    for url in (f"/api/v1/users/{user_id}", "/api/v1/users/?limit=5&sort=-id"):
+        first = client.get(url, headers=auth_headers)
+        before = client.get("/admin/cache").json()["responses"]
+        second = client.get(url, headers=auth_headers)
+        after = client.get("/admin/cache").json()["responses"]
+        assert after["hits"] == before["hits"] + 1
+        assert second.content == first.content
+        assert second.headers.get("ETag") == first.headers.get("ETag")
+
+    # Parameter order does not matter
+    before = client.get("/admin/cache").json()["responses"]
+    client.get("/api/v1/users/?sort=-id&limit=5", headers=auth_headers)
+    assert client.get("/admin/cache").json()["responses"]["hits"] == before["hits"] + 1
+
+
+def test_response_cache_invalidated_by_writes(client: TestClient, auth_headers: dict):
+    """Test creates, updates and deletes are visible to the next cached read"""
+    user_id = _create_users(client, 1)[0]
+    detail_url = f"/api/v1/users/{user_id}"
+    sparse_url = f"/api/v1/users/{user_id}?fields=name"
+    list_url = "/api/v1/users/?sort=-id&limit=2"
+    for url in (detail_url, sparse_url, list_url):
+        client.get(url, headers=auth_headers)
+
+    client.put(detail_url, json={"name": "Recached"}, headers=auth_headers)
+    assert client.get(detail_url, headers=auth_headers).json()["name"] == "Recached"
+    assert client.get(sparse_url, headers=auth_headers).json()["name"] == "Recached"
+    assert client.get(list_url, headers=auth_headers).json()[0]["name"] == "Recached"
+
+    new_id = _create_users(client, 1)[0]
+    assert client.get(list_url, headers=auth_headers).json()[0]["id"] == new_id
+
+    client.delete(detail_url, headers=auth_headers)
+    assert client.get(detail_url, headers=auth_headers).status_code == 404
+    assert user_id not in [user["id"] for user in client.get(list_url, headers=auth_headers).json()]
+
+
+def test_user_read_query_counts(client: TestClient, auth_headers: dict, assert_num_queries):
+    """Test the read endpoints run a fixed number of statements"""
+    user_id = _create_users(client, 1)[0]
+    client.get("/api/v1/users/999999", headers=auth_headers)
+    with assert_num_queries(1):
+        client.get(f"/api/v1/users/{user_id}", headers=auth_headers)
+    with assert_num_queries(0):
+        client.get(f"/api/v1/users/{user_id}", headers=auth_headers)
+    with assert_num_queries(2):
+        client.get("/api/v1/users/?limit=5&count=exact", headers=auth_headers)
+
+
+def test_warm_statement_cache(db: Session, assert_num_queries):
+    """Test the startup warm-up runs every prebuilt read statement once"""
+    expected = {% if cookiecutter.include_authentication == "jwt" %}5{% else %}4{% endif %}
+    {% if cookiecutter.use_async == "yes" -%}
+    async def warm():
+        async with db:
+            return await user_crud.warm_statement_cache(db)
+
+    with assert_num_queries(expected):
+        warmed = asyncio.run(warm())
+    {% else -%}
+    with assert_num_queries(expected):
+        warmed = user_crud.warm_statement_cache(db)
+    {% endif -%}
+    assert warmed == expected
+
+
+def test_query_budget_raise(client: TestClient, auth_headers: dict, monkeypatch):
+    """Test a route over its query budget fails under QUERY_BUDGET_MODE=raise"""
+    client.get("/api/v1/users/999999", headers=auth_headers)
+    monkeypatch.setattr(settings, "query_budget_mode", "raise")
+    monkeypatch.setattr(settings, "query_budgets", {"get_users": 1})
+    with pytest.raises(QueryBudgetExceeded):
+        client.get("/api/v1/users/?limit=5&count=exact", headers=auth_headers)
+    assert client.get("/api/v1/users/?limit=5", headers=auth_headers).status_code == 200
+
+
+def test_update_nonexistent_user(client: TestClient, auth_headers: dict):
+    """Test updating a non-existent user returns 404"""
+    response = client.put("/api/v1/users/99999", json={"name": "Nobody"}, headers=auth_headers)
+    assert response.status_code == 404
+
+
+def test_delete_user(client: TestClient, auth_headers: dict):
+    """Test deleting a user, then deleting it again returns 404"""
+    user_id = _create_users(client, 1)[0]
+    response = client.delete(f"/api/v1/users/{user_id}", headers=auth_headers)
+    assert response.status_code == 204
+    response = client.delete(f"/api/v1/users/{user_id}", headers=auth_headers)
+    assert response.status_code == 404
+    response = client.get(f"/api/v1/users/{user_id}", headers=auth_headers)
+    assert response.status_code == 404
+
+
+def test_export_users_ndjson(client: TestClient, auth_headers: dict):
+    """Test NDJSON export streams one JSON object per user"""
+    created_ids = _create_users(client, 3)
+    response = client.get("/api/v1/users/export?format=ndjson", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert set(created_ids) <= {row["id"] for row in rows}
+    assert [row["id"] for row in rows] == sorted(row["id"] for row in rows)
+    assert all("hashed_password" not in row for row in rows)
+
+
+def test_export_users_csv(client: TestClient, auth_headers: dict):
+    """Test CSV export has a header row and one row per user"""
+    created_ids = _create_users(client, 3)
+    response = client.get("/api/v1/users/export?format=csv", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert set(created_ids) <= {int(row["id"]) for row in rows}
+    assert "email" in rows[0]
+
+    response = client.get("/api/v1/users/export?format=xml", headers=auth_headers)
+    assert response.status_code == 422
+
+
+def _bulk_row(email: str, username: str) -> dict:
+    return {
+        "name": "Bulk User",
+        "email": email,
+        {% if cookiecutter.include_authentication == "jwt" -%}
+        "username": username,
+        "password": "testpassword",
+        {% endif -%}
+    }
+
+
+def test_create_users_bulk(client: TestClient, auth_headers: dict, monkeypatch):
+    """Test bulk create inserts valid rows across chunks and reports rejected ones"""
+    from app.core.config import settings
+    monkeypatch.setattr(settings, "bulk_create_chunk_size", 2)
+
+    suffix = uuid.uuid4().hex[:12]
+    existing_id = _create_users(client, 1)[0]
+    existing_email = client.get(f"/api/v1/users/{existing_id}", headers=auth_headers).json()["email"]
+    rows = [
+        _bulk_row(f"bulk0_{suffix}@example.com", f"bulk0_{suffix}"),
+        _bulk_row(existing_email, f"bulk1_{suffix}"),
+        _bulk_row(f"bulk2_{suffix}@example.com", f"bulk2_{suffix}"),
+        _bulk_row(f"bulk0_{suffix}@example.com", f"bulk3_{suffix}"),
+        _bulk_row(f"bulk4_{suffix}@example.com", f"bulk4_{suffix}"),
+    ]
+    response = client.post("/api/v1/users/bulk", json={"users": rows}, headers=auth_headers)
+    assert response.status_code == 200
+    data = response.json()
+
+    assert len(data["created"]) == 3
+    assert sorted((error["index"], error["field"]) for error in data["errors"]) == [(1, "email"), (3, "email")]
+    for user_id, index in zip(data["created"], (0, 2, 4)):
+        user = client.get(f"/api/v1/users/{user_id}", headers=auth_headers).json()
+        assert user["email"] == rows[index]["email"]
+{% if cookiecutter.include_authentication == "jwt" %}
+
+def test_create_users_bulk_concurrent_writer(client: TestClient, auth_headers: dict, monkeypatch):
+    """Test a value taken while passwords hash is reported, and no password is hashed twice"""
+    from sqlalchemy import insert
+
+    from app.models.user import User
+    from tests.conftest import TestingSessionLocal
+
+    suffix = uuid.uuid4().hex[:12]
+    rows = [_bulk_row(f"race{n}_{suffix}@example.com", f"race{n}_{suffix}") for n in range(3)]
+    hashed = []
+    hash_passwords = user_crud.get_password_hashes{% if cookiecutter.use_async == "yes" %}_async{% endif %}
+
+    {% if cookiecutter.use_async == "yes" %}async {% endif %}def racing_hashes(passwords):
+        if not hashed:
+            # Another writer takes row 1's email while the chunk hashes
+            {% if cookiecutter.use_async == "yes" %}async {% endif %}with TestingSessionLocal() as other:
+                {% if cookiecutter.use_async == "yes" %}await {% endif %}other.execute(insert(User).values(
+                    name="Other", email=rows[1]["email"], username=f"other_{suffix}", hashed_password="x"
+                ))
+                {% if cookiecutter.use_async == "yes" %}await {% endif %}other.commit()
+        hashed.extend(passwords)
+        return {% if cookiecutter.use_async == "yes" %}await {% endif %}hash_passwords(passwords)
+
+    monkeypatch.setattr(user_crud, "get_password_hashes{% if cookiecutter.use_async == "yes" %}_async{% endif %}", racing_hashes)
+    response = client.post("/api/v1/users/bulk", json={"users": rows}, headers=auth_headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data["created"]) == 2
+    assert [(error["index"], error["field"]) for error in data["errors"]] == [(1, "email")]
+    assert len(hashed) == 3
+{% endif %}
+
 def test_create_user_duplicate_email(client: TestClient, db: Session):
     """Test creating user with duplicate email fails"""
     user_data = {
@@ -110,6 +505,42 @@ def test_create_user_duplicate_email(client: TestClient, db: Session):
     assert "email already exists" in response2.json()["detail"]
 
 
+def test_concurrent_duplicate_signups(client: TestClient, concurrent_db{% if cookiecutter.include_authentication == "jwt" %}, monkeypatch{% endif %}):
+    """Test 100 parallel signups for one email create one user and never return a 500"""
+    {% if cookiecutter.include_authentication == "jwt" -%}
+    from passlib.context import CryptContext
+    from app.core import security
+    # Minimum bcrypt cost: the race is under test, not the hashing
+    monkeypatch.setattr(security, "pwd_context", CryptContext(schemes=["bcrypt"], bcrypt__rounds=4))
+    {% endif -%}
+    suffix = uuid.uuid4().hex[:12]
+
+    async def signup_all():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+            return await asyncio.gather(*(
+                http.post("/api/v1/users/", json={
+                    "name": "Race User",
+                    "email": f"race_{suffix}@example.com",
+                    {% if cookiecutter.include_authentication == "jwt" -%}
+                    "username": f"race_{suffix}_{i}",
+                    "password": "testpassword",
+                    {% endif -%}
+                })
+                for i in range(100)
+            ))
+
+    responses = asyncio.run(signup_all())
+    status_codes = [response.status_code for response in responses]
+    assert status_codes.count(201) == 1
+    assert status_codes.count(400) == 99
+    assert all(
+        response.json()["detail"] == "User with this email already exists"
+        for response in responses
+        if response.status_code == 400
+    )
+
+
 {% if cookiecutter.include_authentication == "jwt" -%}
 def test_create_user_duplicate_username(client: TestClient, db: Session):
     """Test creating user with duplicate username fails"""
@@ -156,6 +587,99 @@ def test_login(client: TestClient, db: Session):
     assert data["token_type"] == "bearer"
 
 
+def test_password_hashing_pool_stats(client: TestClient, auth_headers: dict):
+    """Test password hashing runs on the bounded pool and drains afterwards"""
+    response = client.get("/admin/password-hashing")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["completed"] >= 2  # auth_headers hashed and verified a password
+    assert data["in_flight"] == 0
+    assert data["queued"] == 0
+
+
+def test_read_users_me_conditional_request(client: TestClient, auth_headers: dict):
+    """Test /me answers a matching If-None-Match with 304"""
+    response = client.get("/api/v1/users/me", headers=auth_headers)
+    etag = response.headers["ETag"]
+    response = client.get("/api/v1/users/me", headers={**auth_headers, "If-None-Match": etag})
+    assert response.status_code == 304
+
+
+def test_principal_cache_hits(client: TestClient, auth_headers: dict):
+    """Test repeated authenticated requests resolve the user from the cache"""
+    client.get("/api/v1/users/me", headers=auth_headers)
+    before = client.get("/admin/cache").json()["principals"]
+    client.get("/api/v1/users/me", headers=auth_headers)
+    after = client.get("/admin/cache").json()["principals"]
+    assert after["hits"] == before["hits"] + 1
+    assert after["misses"] == before["misses"]
+
+
+def test_principal_cache_invalidated_by_update(client: TestClient, auth_headers: dict):
+    """Test updates through the API are visible to the next authenticated request"""
+    me = client.get("/api/v1/users/me", headers=auth_headers).json()
+    client.put(f"/api/v1/users/{me['id']}", json={"name": "Cached Rename"}, headers=auth_headers)
+    assert client.get("/api/v1/users/me", headers=auth_headers).json()["name"] == "Cached Rename"
+
+    client.put(f"/api/v1/users/{me['id']}", json={"is_active": False}, headers=auth_headers)
+    response = client.get("/api/v1/users/me", headers=auth_headers)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Inactive user"
+
+
+def _login_new_user(client: TestClient) -> dict:
+    username = f"user_{uuid.uuid4().hex[:12]}"
+    client.post("/api/v1/users/", json={
+        "name": "Other User",
+        "email": f"{username}@example.com",
+        "username": username,
+        "password": "testpassword",
+    })
+    response = client.post("/api/v1/users/token", data={"username": username, "password": "testpassword"})
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def test_principal_cache_invalidated_after_evictions(client: TestClient, auth_headers: dict, monkeypatch):
+    """Test writes reach a hot cached principal after colder entries were evicted"""
+    from app.core.cache import create_cache
+
+    monkeypatch.setattr(user_crud, "_principal_cache", create_cache("principals_small", maxsize=4))
+    monkeypatch.setattr(user_crud, "_principal_generations", create_cache("generations_small", maxsize=4))
+    me = client.get("/api/v1/users/me", headers=auth_headers).json()
+    others = [_login_new_user(client) for _ in range(5)]
+    for headers in others:
+        assert client.get("/api/v1/users/me", headers=headers).status_code == 200
+        assert client.get("/api/v1/users/me", headers=auth_headers).status_code == 200
+
+    client.put(f"/api/v1/users/{me['id']}", json={"is_active": False}, headers=auth_headers)
+    assert client.get("/api/v1/users/me", headers=auth_headers).status_code == 400
+
+    other = client.get("/api/v1/users/me", headers=others[-1]).json()
+    client.delete(f"/api/v1/users/{other['id']}", headers=others[-1])
+    assert client.get("/api/v1/users/me", headers=others[-1]).status_code == 401
+
+
+def test_principal_lookup_releases_connection(client: TestClient, auth_headers: dict, db: Session, monkeypatch):
+    """Test resolving the user on a cache miss leaves no transaction holding a connection"""
+    from app.api.v1.endpoints.users import get_current_user
+    from app.core.cache import create_cache
+
+    monkeypatch.setattr(user_crud, "_principal_cache", create_cache("principals_cold", maxsize=4))
+    token = auth_headers["Authorization"].split()[1]
+    {% if cookiecutter.use_async == "yes" -%}
+    async def resolve():
+        async with db:
+            return await get_current_user(token, db), db.in_transaction()
+
+    principal, in_transaction = asyncio.run(resolve())
+    {% else -%}
+    principal = get_current_user(token, db)
+    in_transaction = db.in_transaction()
+    {% endif -%}
+    assert principal.username.startswith("auth_")
+    assert not in_transaction
+
+
 def test_login_invalid_credentials(client: TestClient):
     """Test login with invalid credentials"""
     login_data = {